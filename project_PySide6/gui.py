@@ -1996,6 +1996,58 @@ class TemplateEditor(QWidget):
         return {'valid': True, 'message': ''}
 
 
+def _pick_copy_params(source_files: list[str]) -> Dict[str, Any]:
+    """
+    根据待复制文件的规模选择复制参数
+    
+    少量大文件适合多线程分块复制，大量小文件分块只会增加开销，
+    因此根据前32个文件的大小中位数决定复制策略：
+    - 大量小文件：不分块，逐个单线程复制，读取缓冲区缩小为64KB
+      （单线程复制并计算哈希时使用该缓冲区，不计算哈希时由shutil.copy2完成复制）
+    - 少量大文件：分块复制，线程数随CPU核数增加（最多8个）
+    - 其他情况：使用默认值（1MB分块，4个线程）
+    配置项 copy_buffer_size / copy_parallelism 不为 "auto" 时覆盖自动选择的值。
+    
+    Args:
+        source_files: 待复制的源文件路径列表
+        
+    Returns:
+        传给FileCopyWorker的参数字典，包含chunk_size、max_workers、chunked
+    """
+    params: Dict[str, Any] = {'chunk_size': 1024 * 1024, 'max_workers': 4, 'chunked': True}
+    
+    sizes = []
+    for source_file in source_files[:32]:
+        try:
+            sizes.append(os.path.getsize(source_file))
+        except OSError:
+            continue
+    
+    if sizes:
+        sizes.sort()
+        median_size = sizes[len(sizes) // 2]
+        if len(source_files) > 32 and median_size < 1024 * 1024:
+            # 大量小文件：不分块，逐个直接复制，不需要分块线程
+            params.update(chunk_size=64 * 1024, chunked=False, max_workers=1)
+        elif len(source_files) <= 4 and sizes[0] > 64 * 1024 * 1024:
+            # 少量大文件：每个文件都会被分块，增加并行复制的线程数
+            params['max_workers'] = min(8, max(4, os.cpu_count() or 4))
+    
+    try:
+        config_instance = config.Config()
+        buffer_size = config_instance.get_config("copy_buffer_size", "auto")
+        parallelism = config_instance.get_config("copy_parallelism", "auto")
+    except Exception:
+        return params
+    
+    if isinstance(buffer_size, int) and buffer_size > 0:
+        params['chunk_size'] = buffer_size
+    if isinstance(parallelism, int) and parallelism > 0:
+        params['max_workers'] = parallelism
+    
+    return params
+
+
 class FileCopyWorker(QThread):
     """
     文件复制工作线程
@@ -2003,10 +2055,15 @@ class FileCopyWorker(QThread):
     progress = Signal(int)
     finished = Signal(bool, str)
     
-    def __init__(self, source_files, allocator_instance):
+    def __init__(self, source_files, allocator_instance, chunk_size: int = 1024 * 1024,
+                 max_workers: int = 4, chunked: bool = True, hash_func: Optional[str] = None):
         super().__init__()
         self.source_files = source_files
         self.allocator = allocator_instance
+        self.hash_func = hash_func
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.chunked = chunked
         
     def run(self):
         try:
@@ -2019,8 +2076,9 @@ class FileCopyWorker(QThread):
                     destination_path = self.allocator.execute(source_file)
                     
                     # 复制文件
-                    copier = file_manager.current_copying_instance(source_file)
-                    if copier.copy_initiator((destination_path,)):
+                    copier = file_manager.current_copying_instance(source_file, self.hash_func)
+                    if copier.copy_initiator((destination_path,), self.max_workers,
+                                             self.chunk_size, self.chunked):
                         successful += 1
                     
                     # 更新进度
@@ -2031,6 +2089,9 @@ class FileCopyWorker(QThread):
                     print(f"处理文件 {source_file} 时出错: {e}")
                     continue
             
+            # 本批文件的分析结果写入磁盘缓存，下次处理相同文件时无需重新执行插件
+            self.allocator.flush_cache()
+            
             success_rate = successful / total_files if total_files > 0 else 0
             message = f"完成! 成功处理 {successful}/{total_files} 个文件"
             self.finished.emit(success_rate > 0.8, message)
@@ -2074,6 +2135,13 @@ class FileClassifierGUI(QMainWindow):
         super().__init__()
         self.allocator: Optional['allocator.Allocator'] = None  # 文件分类器实例
         self.init_allocator()
+        
+        # 文件对话框的起始目录，避免每次打开都从默认位置重新枚举
+        try:
+            self._last_browse_dir = config.Config().get_config("last_browse_dir") or os.path.expanduser("~")
+        except Exception:
+            self._last_browse_dir = os.path.expanduser("~")
+        
         self.init_ui()
         
     def init_allocator(self):
@@ -2198,6 +2266,9 @@ class FileClassifierGUI(QMainWindow):
             if callable(gui_function):
                 # 调用插件的GUI函数，传递主窗口作为父窗口
                 result = gui_function(parent=self)
+                # 插件配置可能已修改，丢弃按旧配置得到的分析结果
+                if self.allocator:
+                    self.allocator.invalidate_cache()
                 if result:
                     self.statusBar().showMessage(f"已完成 {target_plugin['plugin_name']} 的 {gui_key} 配置")
             else:
@@ -2705,21 +2776,19 @@ class FileClassifierGUI(QMainWindow):
             
         # 选择测试文件
         test_file, _ = QFileDialog.getOpenFileName(
-            self, "选择测试文件", "", "所有文件 (*.*)"
+            self, "选择测试文件", self._last_browse_dir, "所有文件 (*.*)"
         )
         
         if test_file:
+            self._remember_browse_dir(test_file)
             try:
                 # 更新分类器模板
                 self.allocator.update_template(template)
                 
-                # 执行测试
+                # 执行测试，结果显示在状态栏中，避免弹出模态对话框
                 result = self.allocator.execute(test_file)
                 
-                QMessageBox.information(
-                    self, "测试结果", 
-                    f"源文件: {test_file}\n\n目标路径: {result}"
-                )
+                self.statusBar().showMessage(f"测试结果: {test_file} → {result}")
                 
             except Exception as e:
                 QMessageBox.critical(self, "测试失败", f"测试模板时出错: {str(e)}")
@@ -2744,7 +2813,7 @@ class FileClassifierGUI(QMainWindow):
         
         try:
             self.template_editor.save_template_to_config()
-            QMessageBox.information(self, "成功", "模板已保存!")
+            self.statusBar().showMessage("✓ 模板已保存", 3000)
             
         except Exception as e:
             QMessageBox.critical(self, "保存失败", f"保存模板时出错: {str(e)}")
@@ -2752,14 +2821,27 @@ class FileClassifierGUI(QMainWindow):
     def select_files(self):
         """选择要处理的文件"""
         files, _ = QFileDialog.getOpenFileNames(
-            self, "选择要处理的文件", "", "所有文件 (*.*)"
+            self, "选择要处理的文件", self._last_browse_dir, "所有文件 (*.*)"
         )
         
         if files:
+            self._remember_browse_dir(files[0])
             self.files_list.clear()
             for file_path in files:
                 item = QListWidgetItem(file_path)
                 self.files_list.addItem(item)
+    
+    def _remember_browse_dir(self, file_path: str) -> None:
+        """记录最近一次浏览的目录并保存到配置，下次打开文件对话框时从此处开始"""
+        browse_dir = os.path.dirname(file_path)
+        if not browse_dir or browse_dir == self._last_browse_dir:
+            return
+        
+        self._last_browse_dir = browse_dir
+        try:
+            config.Config().set_config("last_browse_dir", browse_dir)
+        except Exception as e:
+            print(f"保存最近浏览目录失败: {e}")
                 
     def process_files(self):
         """处理选中的文件"""
@@ -2831,8 +2913,10 @@ class FileClassifierGUI(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         
-        # 开始处理
-        self.copy_worker = FileCopyWorker(source_files, self.allocator)
+        # 根据文件规模选择复制参数并开始处理
+        copy_params = _pick_copy_params(source_files)
+        self.copy_worker = FileCopyWorker(source_files, self.allocator,
+                                          hash_func=(self.__hash_func or "").lower(), **copy_params)
         self.copy_worker.progress.connect(self.progress_bar.setValue)
         self.copy_worker.finished.connect(self.on_copy_finished)
         self.copy_worker.start()
@@ -2852,7 +2936,7 @@ class FileClassifierGUI(QMainWindow):
 
     def browse_output_directory(self):
         """浏览选择输出目录"""
-        current_dir = self.output_dir_edit.text() or os.path.expanduser("~")
+        current_dir = self.output_dir_edit.text() or self._last_browse_dir
         
         selected_dir = QFileDialog.getExistingDirectory(
             self, 
@@ -2884,7 +2968,9 @@ class FileClassifierGUI(QMainWindow):
             config_instance = config.Config()
             config_instance.set_config("target_folder", new_dir)
             
-            # 重新初始化allocator
+            # 重新初始化allocator，先释放旧实例的磁盘缓存锁，使新实例可以打开磁盘缓存
+            if self.allocator:
+                self.allocator.close_cache()
             self.allocator = allocator.Allocator(new_dir)
             
             # 更新模板编辑器的allocator引用
@@ -2904,6 +2990,70 @@ class FileClassifierGUI(QMainWindow):
         pass
         
 
+def _build_dark_palette() -> QPalette:
+    """构建深灰色主题调色板，重复使用的颜色只创建一次"""
+    dark = QColor(53, 53, 53)
+    white = QColor(255, 255, 255)
+    black = QColor(0, 0, 0)
+    blue = QColor(42, 130, 218)
+    
+    dark_palette = QPalette()
+    dark_palette.setColor(QPalette.ColorRole.Window, dark)
+    dark_palette.setColor(QPalette.ColorRole.WindowText, white)
+    dark_palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
+    dark_palette.setColor(QPalette.ColorRole.AlternateBase, dark)
+    dark_palette.setColor(QPalette.ColorRole.ToolTipBase, black)
+    dark_palette.setColor(QPalette.ColorRole.ToolTipText, white)
+    dark_palette.setColor(QPalette.ColorRole.Text, white)
+    dark_palette.setColor(QPalette.ColorRole.Button, dark)
+    dark_palette.setColor(QPalette.ColorRole.ButtonText, white)
+    dark_palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
+    dark_palette.setColor(QPalette.ColorRole.Link, blue)
+    dark_palette.setColor(QPalette.ColorRole.Highlight, blue)
+    dark_palette.setColor(QPalette.ColorRole.HighlightedText, black)
+    return dark_palette
+
+
+# 全局深色样式表，在模块导入时构建一次
+DARK_STYLESHEET = """
+        QMainWindow {
+            background-color: #2c2c2c;
+            color: #ffffff;
+        }
+        QWidget {
+            background-color: #2c2c2c;
+            color: #ffffff;
+        }
+        QGroupBox {
+            background-color: #353535;
+            border: 1px solid #555555;
+            border-radius: 4px;
+            margin-top: 10px;
+            padding-top: 10px;
+            font-weight: bold;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px 0 5px;
+            color: #ffffff;
+        }
+        QScrollArea {
+            background-color: #2c2c2c;
+            border: 1px solid #555555;
+        }
+        QListWidget {
+            background-color: #353535;
+            border: 1px solid #555555;
+            color: #ffffff;
+        }
+        QStatusBar {
+            background-color: #353535;
+            color: #ffffff;
+        }
+    """
+
+
 def main() -> None:
     """
     应用程序主入口函数
@@ -2952,60 +3102,10 @@ def main() -> None:
     app.setStyle('Fusion')
     
     # 设置深灰色调色板
-    dark_palette = QPalette()
-    dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-    dark_palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 255, 255))
-    dark_palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
-    dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-    dark_palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(0, 0, 0))
-    dark_palette.setColor(QPalette.ColorRole.ToolTipText, QColor(255, 255, 255))
-    dark_palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
-    dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
-    dark_palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 255, 255))
-    dark_palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
-    dark_palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
-    dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-    dark_palette.setColor(QPalette.ColorRole.HighlightedText, QColor(0, 0, 0))
-    app.setPalette(dark_palette)
+    app.setPalette(_build_dark_palette())
     
     # 设置全局样式表
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #2c2c2c;
-            color: #ffffff;
-        }
-        QWidget {
-            background-color: #2c2c2c;
-            color: #ffffff;
-        }
-        QGroupBox {
-            background-color: #353535;
-            border: 1px solid #555555;
-            border-radius: 4px;
-            margin-top: 10px;
-            padding-top: 10px;
-            font-weight: bold;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            color: #ffffff;
-        }
-        QScrollArea {
-            background-color: #2c2c2c;
-            border: 1px solid #555555;
-        }
-        QListWidget {
-            background-color: #353535;
-            border: 1px solid #555555;
-            color: #ffffff;
-        }
-        QStatusBar {
-            background-color: #353535;
-            color: #ffffff;
-        }
-    """)
+    app.setStyleSheet(DARK_STYLESHEET)
     
     # 创建主窗口
     window = FileClassifierGUI()
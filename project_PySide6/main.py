@@ -33,7 +33,6 @@ Version: 2.0
 import sys
 import argparse
 from typing import Tuple, Optional
-from PySide6.QtWidgets import QApplication, QFileDialog
 import module.config as config
 import module.allocator as allocator
 import module.file_manager as file_manager
@@ -57,7 +56,10 @@ def file_selector() -> Tuple[str, ...]:
     Note:
         - 该函数现在依赖PySide6，与GUI模式保持一致
         - 返回的路径都是绝对路径，便于后续处理
+        - PySide6在此处延迟导入，仅以脚本方式使用本模块时无需加载Qt运行库
     """
+    from PySide6.QtWidgets import QApplication, QFileDialog
+
     # 确保QApplication实例存在
     app = QApplication.instance()
     if not app:
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+分配器模块演示程序
+
+展示插件发现、变量列表和系统状态等核心功能。
+从 project_PySide6 目录运行：python -m module._allocator_demo
+
+演示代码单独存放，正常导入 allocator 模块时无需编译和加载这部分内容。
+"""
+
+from module.allocator import create_allocator
+
+
+# ==================== 模块主程序 ====================
+
+if __name__ == "__main__":
+    """
+    模块测试和演示程序
+    
+    当直接运行此模块时，会执行基本的功能演示，
+    展示插件发现、变量列表和系统状态等核心功能。
+    """
+    # 创建测试用的分类器实例
+    allocator = create_allocator("/tmp/test")
+    
+    print("=" * 60)
+    print("文件分类器核心模块演示")
+    print("=" * 60)
+    
+    print("\n=== 插件变量发现演示 ===")
+    variables_info = allocator.show_available_variables()
+    for plugin_info in variables_info:
+        print(f"\n插件: {plugin_info['plugin_name']}")
+        print(f"描述: {plugin_info['description']}")
+        if plugin_info['variables']:
+            print("变量:")
+            for var in plugin_info['variables']:
+                print(f"  - {var['name']}: {var['description']}")
+    
+    print("\n=== 当前系统状态 ===")
+    print(allocator.show_current_status())
@@ -30,11 +30,25 @@ Version: 1.0.0
 
 import os
 import sys
+import ast
+import stat
+import threading
+import functools
 import importlib
 import importlib.util
 import re
-from typing import Dict, List, Any, Callable, Optional, Set, Union
+import shelve
+from typing import Dict, FrozenSet, List, Any, Callable, Mapping, Optional, Set, Union
 from pathlib import Path
+from collections import ChainMap, OrderedDict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+# 磁盘缓存的进程间排他锁
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
 
 # # 尝试导入配置文件读取模块
 # spec = importlib.util.spec_from_file_location("config", os.path.join(os.path.dirname(__file__),"config.py"))
@@ -45,7 +59,133 @@ from pathlib import Path
 
 from module import config
 
+# 模板语法的预编译正则表达式，避免每次解析时重复编译
+_TEMPLATE_VARS_RE = re.compile(r'\{(?=[^}])([^}\[:]*)[^}]*\}')  # 任意 {…} 占位符，只捕获 '[' 或 ':' 之前的变量名
+_PATH_SEPARATOR_RE = re.compile(r'\s*/[\s/]*')               # 分隔符及其两侧的空白、连续的分隔符
+_TEMPLATE_TOKEN_RE = re.compile(r'\{(\w+)(?:\[(\d+)\])?(?::([^}]+))?\}')  # {variable}、{array[0]}、{variable:default}、{array[0]:default}
+
+# 插件目录中不作为插件加载的辅助模块（如 __init__.py、_common.py、utils.py）
+_PLUGIN_SKIP_PREFIXES = ('_', 'base_', 'common_')
+_PLUGIN_SKIP_NAMES = frozenset({'utils', 'helpers'})
+
+# 名称以这些后缀结尾的插件提供文件分组信息，见get_file_groups
+_GROUP_PLUGIN_SUFFIXES = ('_group', '_grouping')
+
+# 便捷变量与提供其数据的插件之间的对应关系，用于按需加载插件
+_DERIVED_VARIABLE_PLUGINS = {
+    'primary_group': 'manual_grouping',
+    'groups': 'manual_grouping',
+    'size_category': 'file_size_classifier',
+    'file_date': 'file_date_read',
+}
+
+# 反向表：插件名 -> 由其提供数据的便捷变量，导入时构建一次
+_PLUGIN_DERIVED_VARIABLES: Dict[str, FrozenSet[str]] = {}
+for _var_name, _plugin_name in _DERIVED_VARIABLE_PLUGINS.items():
+    _PLUGIN_DERIVED_VARIABLES[_plugin_name] = _PLUGIN_DERIVED_VARIABLES.get(_plugin_name, frozenset()) | {_var_name}
+del _var_name, _plugin_name
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_template_variables(template: str) -> FrozenSet[str]:
+    """提取模板中引用的变量名，结果按模板字符串缓存"""
+    # 正则只捕获变量名，数组访问和默认值部分（如 manual_grouping[0]、file_date:nodate）不进入分组
+    return frozenset(_TEMPLATE_VARS_RE.findall(template))
+
+
+# 查找插件属性时的哨兵默认值，用于区分"属性不存在"与值为None
+_MISSING = object()
+
+# 插件模块未定义addon_variables时使用的共享只读默认值，避免每次调用都新建空列表
+_EMPTY_VARIABLES: tuple = ()
+
+
+@dataclass(slots=True)
+class PluginRecord:
+    """已加载插件的模块、源文件路径及其注册的各类函数"""
+    module: Any
+    path: str                                   # 插件源文件路径，用于重载
+    execute: Optional[Callable[[str], Any]] = None
+    init: Optional[Callable[..., Any]] = None
+    delete: Optional[Callable[..., Any]] = None
+    reload: Optional[Callable[..., Any]] = None
+
+
+@dataclass(slots=True)
+class FileDataEntry:
+    """文件分析结果缓存的一条记录，比等价的三键字典占用更少内存"""
+    mtime: float                                # 分析时文件的修改时间
+    plugins: FrozenSet[str]                     # 执行分析时已加载的插件集合（相同集合的记录共享同一对象）
+    data: Dict[str, Any]                        # 分析结果
+
+
+class _SafeFormatDict(dict):
+    """str.format_map使用的变量字典，缺失的变量保留原始占位符"""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _plain_template_value(value: Any) -> str:
+    """普通{variable}占位符的取值规则：None、空字符串和空列表/元组替换为空字符串"""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (list, tuple)) and len(value) == 0:
+        return ""
+    return str(value)
+
 #运行类
+def _user_cache_dir() -> str:
+    """
+    当前用户的缓存目录下本程序使用的子目录
+    
+    Windows 为 %LOCALAPPDATA%，macOS 为 ~/Library/Caches，
+    其他系统为 $XDG_CACHE_HOME（未设置时为 ~/.cache）。
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    elif sys.platform == 'darwin':
+        base = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'movefile')
+
+
+def _lock_file_exclusive(lock_path: str) -> Optional[Any]:
+    """
+    以非阻塞方式对锁文件加排他锁
+    
+    Returns:
+        持有锁的文件对象，关闭前一直持有锁；锁已被其他进程持有时返回None
+        
+    Raises:
+        OSError: 锁文件无法创建或打开时
+    """
+    lock_file = open(lock_path, 'a+b')
+    try:
+        if os.name == 'nt':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _unlock_file(lock_file: Any) -> None:
+    """释放_lock_file_exclusive取得的锁并关闭锁文件"""
+    try:
+        if os.name == 'nt':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    finally:
+        lock_file.close()
+
+
 class Allocator:
     """
     文件分类器核心类 - 插件化的文件分组与路径生成系统
@@ -74,6 +214,40 @@ class Allocator:
         >>> print(target_path)  # /output/dir/Documents/file
     """
     
+    # 固定实例属性，省去每个实例的__dict__并加快属性访问；新增属性时需同步添加
+    __slots__ = (
+        'plugins_dirs',
+        'loaded_plugins',
+        '_group_plugins',
+        'discovered_modules',
+        '_failed_imports',
+        '_plugin_modules',
+        'file_data',
+        '_file_data_lock',
+        '_file_data_capacity',
+        '_plugins_snapshot',
+        '_plugins_fingerprint',
+        '_disk_cache',
+        '_disk_cache_path',
+        '_disk_cache_lock',
+        '_pending_disk_writes',
+        '_executor',
+        'available_variables',
+        'active_variables',
+        '_var_to_plugin',
+        '_plugin_to_vars',
+        'current_template',
+        '_compiled_template',
+        '_format_variables',
+        '_template_renderer',
+        '_temporary_renderers',
+        '_status_cache',
+        '_variables_cache',
+        '_plugins_discovered',
+        '__dest_dir',
+        '_dest_prefix',
+    )
+    
     def __init__(self, target_folder: str, plugins_dir: Optional[str] = None) -> None:
         """
         初始化文件分类器
@@ -88,7 +262,8 @@ class Allocator:
             OSError: 当目标文件夹无法创建时
         
         Note:
-            - 初始化过程中会自动扫描并加载所有可用插件
+            - 初始化时不扫描插件目录，首次需要插件信息时才通过_ensure_plugins_discovered发现插件
+            - 插件模块按需导入，只导入当前模板用到的变量所对应的插件
             - 插件加载失败不会影响系统启动，会静默跳过失败的插件
             - 基础变量（filename、basename、ext等）会自动注册
         """
@@ -115,69 +290,130 @@ class Allocator:
         if external_plugins_dir:
             self.plugins_dirs.append(external_plugins_dir)
 
-        self.loaded_plugins: Dict[str, Dict[str, Any]] = {}  # 已加载的插件信息字典
+        self.loaded_plugins: Dict[str, PluginRecord] = {}  # 已加载的插件：插件名 -> 模块及注册的函数
+        self._group_plugins: Set[str] = set()               # 已加载插件中提供分组信息的插件（名称以_group/_grouping结尾）
         self.discovered_modules: Dict[str, Any] = {}  # 缓存发现阶段加载的模块
-        
-        # 存储插件注册的函数，按功能分类管理
-        self.init_functions: Dict[str, Callable[..., Any]] = {}      # 插件初始化函数
-        self.execute_functions: Dict[str, Callable[[str], Any]] = {} # 插件执行函数
-        self.delete_functions: Dict[str, Callable[..., Any]] = {}    # 插件清理函数
-        self.reload_functions: Dict[str, Callable[..., Any]] = {}    # 插件重载函数
-        
-        # 文件分析结果存储，采用LRU缓存策略
-        self.file_data: Dict[str, Dict[str, Any]] = {}
+        self._failed_imports: Dict[str, float] = {}   # 导入失败的插件路径 -> 失败时的文件修改时间
+        self._plugin_modules: Dict[str, List[str]] = {}  # 插件名 -> 导入时注册到sys.modules的模块名
+
+        # 文件分析结果缓存（LRU）：绝对路径 -> FileDataEntry
+        self.file_data: OrderedDict[str, FileDataEntry] = OrderedDict()
+        self._plugins_snapshot: FrozenSet[str] = frozenset()     # 最近一次分析时的插件集合，供缓存记录共享
+        self._file_data_capacity: int = 4096                     # 缓存的最大文件数，超出时淘汰最久未使用的结果
+        self._file_data_lock = threading.Lock()                  # 保护批量并行分析时对缓存的写入和LRU顺序调整
+        
+        # 磁盘缓存：保存上次运行的分析结果，放在当前用户的缓存目录下，打开期间持有排他锁
+        # 以文件的 (st_mtime_ns, st_size) 和执行时的插件指纹（插件源文件及其配置文件的状态）判断是否仍然有效
+        self._disk_cache: Union[shelve.Shelf, None, bool] = None  # None: 尚未打开；False: 无法打开，已禁用
+        self._disk_cache_path: str = os.path.join(_user_cache_dir(), 'allocator_cache')
+        self._disk_cache_lock: Optional[Any] = None              # 持有磁盘缓存排他锁的锁文件
+        self._plugins_fingerprint: Optional[tuple] = None        # 当前插件集合的指纹，插件集合变化或缓存失效时重新计算
+        self._pending_disk_writes: Dict[str, Dict[str, Any]] = {}  # 尚未写入磁盘缓存的分析结果
+        self._executor: Optional[ThreadPoolExecutor] = None      # batch_execute使用的线程池（延迟创建）
         
         # 插件变量管理系统
         self.available_variables: Dict[str, Dict[str, Any]] = {}  # 所有可用变量的元数据
-        self.active_variables: Set[str] = set()                  # 当前模板激活的变量集合
+        self.active_variables: FrozenSet[str] = frozenset()      # 当前模板激活的变量集合
+        self._var_to_plugin: Dict[str, str] = {}                 # 变量名 -> 提供该变量的插件名
+        self._plugin_to_vars: Dict[str, Set[str]] = {}           # 插件名 -> 该插件提供的变量名集合
         self.current_template: str = ""                          # 当前使用的路径模板
+        self._compiled_template: Optional[List[tuple]] = None    # 当前模板预编译的操作码列表
+        self._format_variables: Optional[tuple] = None           # 简单模板引用的变量名，非简单模板为None
+        self._template_renderer: Optional[Callable[[Mapping[str, Any]], str]] = None  # 为当前模板生成的专用渲染函数
+        self._temporary_renderers: Dict[str, Optional[Callable]] = {}  # 临时模板 -> 渲染函数，只出现过一次的模板为None
+        self._status_cache: Optional[str] = None                 # show_current_status的缓存，状态变化时置为None
+        self._variables_cache: Optional[List[Dict[str, Any]]] = None  # show_available_variables的缓存，变量索引变化时置为None
+        self._plugins_discovered: bool = False                   # 插件目录是否已扫描（首次需要插件信息时才扫描）
         self.__dest_dir: str = target_folder                     # 目标输出目录（私有）
+        self._dest_prefix: str = os.path.join(target_folder, '') # 带结尾分隔符的目标目录，用于直接拼接路径
         
-        # 初始化流程：按顺序执行以下步骤
-        self._register_base_variables()    # 1. 注册系统基础变量
-        self._discover_plugin_variables()  # 2. 扫描发现插件变量
-        self._load_plugins()               # 3. 加载所有插件
-        self._execute_init_functions()     # 4. 执行插件初始化函数
+        # 初始化时只注册系统基础变量；插件目录的扫描和插件初始化函数
+        # 推迟到第一次需要插件信息时（见_ensure_plugins_discovered）
+        self._register_base_variables()
 
-    def _load_plugins(self) -> None:
+    def _ensure_plugins_discovered(self) -> None:
         """
-        加载所有插件目录下的可用插件
+        首次需要插件信息时扫描插件目录并执行插件初始化函数，之后直接返回
         
-        该方法会扫描所有指定的插件目录，查找所有.py文件和编译后的扩展文件，
-        并尝试逐个加载。支持热插拔的外部插件。
+        构造Allocator时不再扫描插件目录，只创建实例而不使用插件的调用方
+        无需承担遍历目录和解析插件的开销。
+        """
+        if self._plugins_discovered:
+            return
+        self._plugins_discovered = True
+        self._scan_and_load_plugins()   # 扫描发现插件变量（插件按模板需要延迟加载）
+        self._execute_init_functions()  # 执行已加载插件的初始化函数
+
+    def _scan_plugin_files(self) -> List[tuple]:
+        """
+        扫描所有插件目录，列出可用的插件文件
         
-        加载流程：
-        1. 检查各插件目录是否存在
-        2. 扫描目录中的插件文件（.py, .so, .pyd, .dll等）
-        3. 对每个插件，获取其绝对路径
-        4. 逐个调用_load_single_plugin加载插件
+        使用 os.scandir 一次遍历获取文件名和类型，避免对每个条目重复 stat。
         
+        Returns:
+            (插件名称, 插件绝对路径, 是否为.py源文件) 元组列表
+            
         Note:
-            - 插件加载失败不会抛出异常，而是静默跳过
-            - 支持热重载，重复调用此方法可重新加载插件
-            - 插件必须符合标准接口才能被正确识别
-            - 外部插件优先级高于内置插件
+            - 支持Python源文件和编译后的扩展文件（.so, .pyd, .dll, .dylib）
+            - 辅助模块会被忽略：以 '_'、'base_'、'common_' 开头的文件，以及 utils、helpers
+            - 不存在的插件目录会被跳过
         """
+        plugin_files = []
         for plugins_dir in self.plugins_dirs:
-            if not os.path.exists(plugins_dir):
+            # 直接打开目录，不存在时由scandir报错，省去一次单独的isdir stat
+            try:
+                entries = os.scandir(plugins_dir)
+            except (FileNotFoundError, NotADirectoryError):
                 continue
             
-            # 查找Python源文件和编译后的扩展文件
-            plugin_files = []
-            if os.path.isdir(plugins_dir):
-                for f in os.listdir(plugins_dir):
-                    if (f.endswith('.py') and not f.startswith('__')) or \
-                       f.endswith(('.so', '.pyd', '.dll', '.dylib')):
-                        plugin_files.append(f)
-            
-            for plugin_file in plugin_files:
-                plugin_name = plugin_file.split('.')[0]  # 移除扩展名
-                plugin_path = os.path.join(plugins_dir, plugin_file) # 获取完整路径
-                try:
-                    self._load_single_plugin(plugin_name, plugin_path)
-                except Exception as e:
-                    print(f"插件加载失败: {plugin_name} - {e}")
-                    pass  # 静默处理插件加载失败
+            with entries:
+                for entry in entries:
+                    # 先按文件名过滤，跳过辅助模块（如 __init__.py、_common.py、utils.py），
+                    # 只有可能是插件的条目才需要检查文件类型
+                    file_name = entry.name
+                    if file_name.startswith(_PLUGIN_SKIP_PREFIXES):
+                        continue
+                    is_source = file_name.endswith('.py')
+                    if not is_source and not file_name.endswith(('.so', '.pyd', '.dll', '.dylib')):
+                        continue
+                    # 移除扩展名；插件名会作为多个字典的键反复查找，驻留后比较可直接比对地址
+                    plugin_name = file_name.partition('.')[0]
+                    if plugin_name in _PLUGIN_SKIP_NAMES or not entry.is_file():
+                        continue
+                    plugin_files.append((sys.intern(plugin_name), os.path.join(plugins_dir, file_name), is_source))
+        return plugin_files
+
+    def _scan_and_load_plugins(self) -> None:
+        """
+        扫描插件目录，发现插件变量，插件模块按需延迟加载
+        
+        每个插件目录只遍历一次。.py源文件插件只登记元数据，
+        真正的导入和函数注册推迟到_load_plugins_for_variables中，
+        即模板实际用到该插件的变量时才进行。
+        
+        流程：
+        1. 清空变量索引并重新注册基础变量
+        2. 调用_scan_plugin_files列出插件文件
+        3. 对.py源文件调用_discover_single_plugin_variables发现变量
+        4. 编译后的扩展插件无法静态分析，直接调用_load_single_plugin加载
+        
+        Note:
+            - 插件发现或加载失败不会抛出异常，而是静默跳过
+            - 外部插件优先级高于内置插件
+        """
+        self.available_variables.clear()
+        self._var_to_plugin.clear()
+        self._plugin_to_vars.clear()
+        self._status_cache = None
+        self._variables_cache = None
+        self._register_base_variables()
+
+        # 两个方法内部都会捕获并报告各自的错误，这里无需再包一层异常处理
+        for plugin_name, plugin_path, is_source in self._scan_plugin_files():
+            if is_source:
+                self._discover_single_plugin_variables(plugin_name, plugin_path)
+            else:
+                self._load_single_plugin(plugin_name, plugin_path)
     
     def _load_single_plugin(self, plugin_name: str, plugin_path: str) -> None:
         """
@@ -197,7 +433,7 @@ class Allocator:
         1. 使用 importlib.util.spec_from_file_location 创建模块规范
         2. 使用 importlib.util.module_from_spec 创建模块对象
         3. 执行模块加载
-        4. 创建插件信息字典
+        4. 创建插件记录PluginRecord
         5. 调用_register_plugin_functions注册函数
         6. 将插件添加到已加载插件列表
         
@@ -205,51 +441,121 @@ class Allocator:
             - 这种方法对于处理 .py 源码插件在不同环境（开发、打包后）下非常稳健。
             - 插件必须至少提供一个execute函数才会被成功加载
         """
+        plugin_name = sys.intern(plugin_name)
         try:
             # 如果插件已经加载，先执行卸载逻辑
             if plugin_name in self.loaded_plugins:
                 self.unload_plugin(plugin_name)
 
-            # 检查模块是否已在发现阶段加载并缓存
-            if plugin_name in self.discovered_modules:
-                plugin_module = self.discovered_modules[plugin_name]
-            else:
-                # 如果未缓存，则从文件加载（用于按需加载等场景）
-                spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-                if spec is None or spec.loader is None:
-                    raise ImportError(f"无法为插件 {plugin_name} 创建模块规范或加载器，路径: {plugin_path}")
-                
-                plugin_module = importlib.util.module_from_spec(spec)
-                
-                # 在执行模块之前，将其添加到sys.modules
-                sys.modules[spec.name] = plugin_module
-                spec.loader.exec_module(plugin_module)
+            plugin_module = self._cached_import(plugin_name, plugin_path)
 
-            plugin_info = {
-                'module': plugin_module,
-                'path': plugin_path, # 存储路径以便重载
-                'init': None,
-                'execute': None,
-                'delete': None
-            }
+            plugin_record = PluginRecord(module=plugin_module, path=plugin_path)
             
             # 查找插件的注册函数
-            self._register_plugin_functions(plugin_name, plugin_module, plugin_info)
+            self._register_plugin_functions(plugin_name, plugin_module, plugin_record)
             
-            if plugin_info['execute']:
-                self.loaded_plugins[plugin_name] = plugin_info
+            if plugin_record.execute:
+                self.loaded_plugins[plugin_name] = plugin_record
+                if plugin_name.endswith(_GROUP_PLUGIN_SUFFIXES):
+                    self._group_plugins.add(plugin_name)
+                self._status_cache = None
                 
         except Exception as e:
             # 捕获并打印更详细的错误信息
             print(f"加载插件 {plugin_name} 时出错: {e}")
             # 如果插件已添加到sys.modules，加载失败时最好将其移除
-            if plugin_name in sys.modules:
-                del sys.modules[plugin_name]
+            sys.modules.pop(plugin_name, None)
             pass
 
-    def _register_plugin_functions(self, plugin_name: str, plugin_module: Any, plugin_info: Dict[str, Any]) -> None:
+    def _cached_import(self, plugin_name: str, plugin_path: str) -> Any:
         """
-        注册插件提供的各种函数到相应的函数字典中
+        导入插件模块并缓存，发现阶段和加载阶段共用同一个模块对象
+        
+        查找顺序：
+        1. discovered_modules 缓存
+        2. sys.modules 中已存在且来自同一文件的模块
+        3. 使用 importlib.util.spec_from_file_location 从文件加载
+        
+        导入失败的插件文件会被记录，文件修改之前不会再次尝试导入。
+        
+        Args:
+            plugin_name: 插件名称（不含扩展名）
+            plugin_path: 插件文件的绝对路径
+            
+        Returns:
+            插件模块对象
+            
+        Raises:
+            ImportError: 当无法为插件创建模块规范或加载器，或插件此前导入失败且文件未修改时
+        """
+        cache = self.discovered_modules
+        plugin_module = cache.get(plugin_name)
+        if plugin_module is not None:
+            return plugin_module
+        
+        modules = sys.modules
+        plugin_module = modules.get(plugin_name)
+        if plugin_module is None or getattr(plugin_module, '__file__', None) != plugin_path:
+            # 上次导入失败且文件未修改，不再重复执行注定失败的导入
+            if self._import_failed_unchanged(plugin_path):
+                raise ImportError(f"插件 {plugin_name} 此前导入失败，文件修改后才会重试: {plugin_path}")
+            
+            spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"无法为插件 {plugin_name} 创建模块规范或加载器，路径: {plugin_path}")
+            
+            plugin_module = importlib.util.module_from_spec(spec)
+            
+            # 在执行模块之前，将其添加到sys.modules
+            modules_before = set(modules)
+            modules[spec.name] = plugin_module
+            try:
+                spec.loader.exec_module(plugin_module)
+                
+                # 记录插件自身及其子模块，卸载时直接移除，无需扫描sys.modules
+                # 先用集合差得到新增模块的快照，避免遍历可能被其他线程修改的sys.modules
+                prefix = plugin_name + '.'
+                self._plugin_modules[plugin_name] = [
+                    name for name in modules.keys() - modules_before
+                    if name == plugin_name or name.startswith(prefix)
+                ]
+            except Exception:
+                modules.pop(spec.name, None)
+                try:
+                    self._failed_imports[plugin_path] = os.stat(plugin_path).st_mtime
+                except OSError:
+                    pass
+                raise
+        
+        cache[plugin_name] = plugin_module
+        return plugin_module
+
+    def _import_failed_unchanged(self, plugin_path: str) -> bool:
+        """
+        检查插件文件上次导入失败后是否仍未修改
+        
+        失败记录以文件修改时间为指纹，文件被修改后记录自动作废并被移除。
+        
+        Args:
+            plugin_path: 插件文件的绝对路径
+            
+        Returns:
+            bool: 上次导入失败且文件未修改时返回True
+        """
+        failed_mtime = self._failed_imports.get(plugin_path)
+        if failed_mtime is None:
+            return False
+        try:
+            unchanged = os.stat(plugin_path).st_mtime == failed_mtime
+        except OSError:
+            unchanged = True
+        if not unchanged:
+            del self._failed_imports[plugin_path]
+        return unchanged
+
+    def _register_plugin_functions(self, plugin_name: str, plugin_module: Any, plugin_record: PluginRecord) -> None:
+        """
+        将插件提供的各种函数注册到插件记录中
         
         该方法负责发现和注册插件的标准函数（init、execute、delete、reload），
         支持多种函数命名规范以保证向后兼容性。
@@ -257,7 +563,7 @@ class Allocator:
         Args:
             plugin_name: 插件名称，用于生成标准函数名
             plugin_module: 已导入的插件模块对象
-            plugin_info: 插件信息字典，用于存储发现的函数
+            plugin_record: 插件记录，用于存储发现的函数
         
         函数发现策略：
         1. 标准命名：{plugin_name}_init, {plugin_name}, {plugin_name}_delete
@@ -282,79 +588,45 @@ class Allocator:
         """
         
         # 方法1: 查找标准命名的函数
-        init_func_name = f"{plugin_name}_init"
-        execute_func_name = plugin_name  # 主函数直接用插件名
-        delete_func_name = f"{plugin_name}_delete"
-        reload_func_name = f"{plugin_name}_reload"
-        
-        # 检查主执行函数
-        if hasattr(plugin_module, execute_func_name):
-            func = getattr(plugin_module, execute_func_name)
-            if callable(func):
-                plugin_info['execute'] = func
-                self.execute_functions[plugin_name] = func
-        
-        # 检查初始化函数
-        if hasattr(plugin_module, init_func_name):
-            func = getattr(plugin_module, init_func_name)
-            if callable(func):
-                plugin_info['init'] = func
-                self.init_functions[plugin_name] = func
-        
-        # 简化的函数查找 - 查找 init, delete, reload
-        for func_name in ['init', 'delete', 'reload']:
-            if hasattr(plugin_module, func_name):
-                func = getattr(plugin_module, func_name)
-                if callable(func):
-                    if func_name == 'init':
-                        plugin_info['init'] = func
-                        self.init_functions[plugin_name] = func
-                    elif func_name == 'delete':
-                        plugin_info['delete'] = func
-                        self.delete_functions[plugin_name] = func
-                    elif func_name == 'reload':
-                        plugin_info['reload'] = func
-                        self.reload_functions[plugin_name] = func
-        
-        # 检查删除函数
-        if hasattr(plugin_module, delete_func_name):
-            func = getattr(plugin_module, delete_func_name)
-            if callable(func):
-                plugin_info['delete'] = func
-                self.delete_functions[plugin_name] = func
-        
-        # 检查重新加载函数
-        if hasattr(plugin_module, reload_func_name):
-            func = getattr(plugin_module, reload_func_name)
-            if callable(func):
-                plugin_info['reload'] = func
-                self.reload_functions[plugin_name] = func
+        # 每个属性只查找一次，_MISSING 区分"不存在"与值为None的属性
+        module_get = plugin_module.__dict__.get
+        
+        # 按优先级查找各函数的候选名称，命中即停止：主执行函数直接用插件名，
+        # init 优先使用简化命名，delete/reload 优先使用 {plugin_name}_delete/_reload
+        lookup_order = (
+            ('execute', (plugin_name,)),
+            ('init', ('init', f"{plugin_name}_init")),
+            ('delete', (f"{plugin_name}_delete", 'delete')),
+            ('reload', (f"{plugin_name}_reload", 'reload')),
+        )
+        for func_type, attr_names in lookup_order:
+            for attr_name in attr_names:
+                func = module_get(attr_name, _MISSING)
+                if func is not _MISSING and callable(func):
+                    setattr(plugin_record, func_type, func)
+                    break
         
         # 查找通过 addon_variables 注册的函数（向后兼容）
-        if hasattr(plugin_module, 'addon_variables') or hasattr(plugin_module, 'addon_variabls'):
-            addon_vars = getattr(plugin_module, 'addon_variables', None) or getattr(plugin_module, 'addon_variabls', None)
-            
+        addon_vars = module_get('addon_variables', None) or module_get('addon_variabls', None)
+        if addon_vars is not None:
             if isinstance(addon_vars, dict):
                 # 旧格式：字典格式
                 for var_name, var_func in addon_vars.items():
-                    if callable(var_func) and not plugin_info['execute']:
-                        plugin_info['execute'] = var_func
-                        self.execute_functions[plugin_name] = var_func
+                    if callable(var_func) and not plugin_record.execute:
+                        plugin_record.execute = var_func
                         break
-            elif isinstance(addon_vars, str) and hasattr(plugin_module, addon_vars):
+            elif isinstance(addon_vars, str):
                 # 字符串格式
-                func = getattr(plugin_module, addon_vars)
-                if callable(func) and not plugin_info['execute']:
-                    plugin_info['execute'] = func
-                    self.execute_functions[plugin_name] = func
+                func = module_get(addon_vars, _MISSING)
+                if func is not _MISSING and callable(func) and not plugin_record.execute:
+                    plugin_record.execute = func
             elif isinstance(addon_vars, list):
                 # 新格式：数组格式
                 for var_info in addon_vars:
                     if isinstance(var_info, dict) and 'method' in var_info:
                         var_func = var_info['method']
-                        if callable(var_func) and not plugin_info['execute']:
-                            plugin_info['execute'] = var_func
-                            self.execute_functions[plugin_name] = var_func
+                        if callable(var_func) and not plugin_record.execute:
+                            plugin_record.execute = var_func
                             break
     
     def _register_base_variables(self) -> None:
@@ -407,6 +679,38 @@ class Allocator:
         
         # 注册基础变量
         self.available_variables.update(base_variables)
+        self._index_plugin_variables('base_variables')
+
+    def _index_plugin_variables(self, plugin_name: str) -> None:
+        """
+        将插件提供的变量登记到变量与插件的双向索引中
+        
+        按需加载和卸载插件时通过索引直接查找，
+        无需遍历所有插件的变量列表。由该插件提供数据的便捷变量
+        （见_DERIVED_VARIABLE_PLUGINS）也会登记到该插件名下。
+        
+        Args:
+            plugin_name: 已写入available_variables的插件名称
+        """
+        plugin_info = self.available_variables.get(plugin_name, {})
+        var_names = {
+            var['name'] for var in plugin_info.get('variables', [])
+            if isinstance(var, dict) and 'name' in var
+        }
+        var_names |= _PLUGIN_DERIVED_VARIABLES.get(plugin_name, frozenset())
+        
+        self._plugin_to_vars[plugin_name] = var_names
+        for var_name in var_names:
+            self._var_to_plugin[var_name] = plugin_name
+        self._variables_cache = None
+
+    def _unindex_plugin_variables(self, plugin_name: str) -> None:
+        """从变量与插件的双向索引中移除指定插件"""
+        var_to_plugin = self._var_to_plugin
+        for var_name in self._plugin_to_vars.pop(plugin_name, ()):
+            if var_to_plugin.get(var_name) == plugin_name:
+                var_to_plugin.pop(var_name)
+        self._variables_cache = None
 
     def _execute_init_functions(self) -> None:
         """
@@ -431,48 +735,14 @@ class Allocator:
             - 初始化失败不会将插件从已加载列表中移除
             - 可通过日志系统记录初始化过程中的问题
         """
-        for plugin_name, init_func in self.init_functions.items():
-            try:
-                init_func()
-            except Exception:
-                pass  # 静默处理初始化失败
-
-    def _discover_plugin_variables(self) -> None:
-        """
-        扫描插件目录，发现所有可用的变量并构建变量索引
-        
-        这是变量发现系统的入口点，负责扫描整个插件目录，
-        分析每个插件提供的变量，并构建完整的变量元数据索引。
-        这个索引用于模板验证、变量提示和按需插件加载。
-        
-        发现流程：
-        1. 检查插件目录的存在性
-        2. 扫描所有.py文件（排除特殊文件）
-        3. 对每个插件调用_discover_single_plugin_variables
-        4. 构建全局变量索引
-        
-        Note:
-            - 发现过程不会实际加载插件，只是分析元数据
-            - 插件分析失败会被静默跳过
-        """
-        self.available_variables.clear()
-        self._register_base_variables()
-
-        for plugins_dir in self.plugins_dirs:
-            if not os.path.exists(plugins_dir):
+        for plugin_record in self.loaded_plugins.values():
+            if plugin_record.init is None:
                 continue
-                
-            plugin_files = [f for f in os.listdir(plugins_dir) 
-                           if f.endswith('.py') and not f.startswith('__')]
-            
-            for plugin_file in plugin_files:
-                plugin_name = plugin_file[:-3]
-                plugin_path = os.path.join(plugins_dir, plugin_file) # 获取完整路径
-                try:
-                    self._discover_single_plugin_variables(plugin_name, plugin_path)
-                except Exception as e:
-                    print(f"发现插件变量失败: {plugin_name} - {e}")
-                    pass  # 静默处理发现失败
+            try:
+                plugin_record.init()
+            except Exception as e:
+                # 插件代码可能抛出任意异常，初始化失败不影响其他插件
+                print(f"插件 {plugin_record.module.__name__} 初始化失败: {e}")
 
     def _discover_single_plugin_variables(self, plugin_name: str, plugin_path: str) -> None:
         """
@@ -486,18 +756,21 @@ class Allocator:
             plugin_path: 插件文件的绝对路径
         """
         try:
-            spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-            if spec is None or spec.loader is None:
-                return # 无法处理，静默失败
+            # 优先静态解析元数据，避免在发现阶段执行插件代码
+            try:
+                plugin_metadata = self._discover_metadata_via_ast(plugin_name, plugin_path)
+            except (SyntaxError, ValueError, OSError):
+                plugin_metadata = None  # 无法静态解析，回退到真实导入
             
-            plugin_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(plugin_module)
+            if plugin_metadata is not None:
+                self.available_variables[plugin_name] = plugin_metadata
+                self._index_plugin_variables(plugin_name)
+                return
 
-            # 缓存加载的模块以供后续重用，避免重复加载
-            self.discovered_modules[plugin_name] = plugin_module
+            plugin_module = self._cached_import(plugin_name, plugin_path)
 
             # 从 addon_variables 属性中提取变量信息
-            addon_vars = getattr(plugin_module, 'addon_variables', [])
+            addon_vars = plugin_module.__dict__.get('addon_variables', _EMPTY_VARIABLES)
             
             # 从模块的文档字符串中获取插件的整体描述
             plugin_description = plugin_module.__doc__.strip() if plugin_module.__doc__ else f'{plugin_name} 插件'
@@ -516,10 +789,72 @@ class Allocator:
                 'gui': gui_info,
                 'plugin_path': plugin_path
             }
+            self._index_plugin_variables(plugin_name)
         except Exception as e:
             print(f"解析插件 {plugin_name} 变量时出错: {e}")
             pass # 静默处理发现失败
 
+    def _discover_metadata_via_ast(self, plugin_name: str, plugin_path: str) -> Optional[Dict[str, Any]]:
+        """
+        通过 ast 静态解析插件源码中的 addon_variables，不执行插件模块
+        
+        只有当 addon_variables 中除 method 以外的字段都是字面量时才能静态解析。
+        gui 字段中注册了回调函数的插件必须导入后才能取得函数对象，返回None。
+        
+        Args:
+            plugin_name: 插件名称（不含.py扩展名）
+            plugin_path: 插件文件的绝对路径
+            
+        Returns:
+            与_discover_single_plugin_variables相同格式的插件元数据，
+            无法静态解析时返回None
+            
+        Raises:
+            SyntaxError: 插件源码无法解析
+            ValueError: addon_variables 中包含非字面量的值
+            OSError: 插件文件无法读取
+        """
+        with open(plugin_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=plugin_path)
+        
+        # 查找模块顶层最后一次对 addon_variables 的赋值
+        addon_node = None
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == 'addon_variables'
+                for target in node.targets
+            ):
+                addon_node = node.value
+        
+        if not isinstance(addon_node, ast.List) or not addon_node.elts:
+            return None
+        
+        addon_vars = []
+        for element in addon_node.elts:
+            if not isinstance(element, ast.Dict):
+                return None
+            var_info: Dict[str, Any] = {}
+            for key_node, value_node in zip(element.keys, element.values):
+                if not isinstance(key_node, ast.Constant):
+                    return None
+                if key_node.value == 'method':
+                    continue  # 执行函数在真正加载插件时注册
+                if key_node.value == 'gui' and isinstance(value_node, ast.Dict) and value_node.keys:
+                    return None  # GUI回调需要导入模块才能获得
+                var_info[key_node.value] = ast.literal_eval(value_node)
+            if 'name' not in var_info:
+                return None
+            addon_vars.append(var_info)
+        
+        docstring = ast.get_docstring(tree, clean=False)
+        return {
+            'plugin_name': plugin_name,
+            'description': docstring.strip() if docstring else f'{plugin_name} 插件',
+            'variables': addon_vars,
+            'gui': addon_vars[0].get('gui', {}),
+            'plugin_path': plugin_path
+        }
+
     def show_available_variables(self) -> List[Dict[str, Any]]:
         """
         获取所有可用变量的信息列表，用于界面展示和模板验证
@@ -559,33 +894,38 @@ class Allocator:
             - 返回的是所有已发现的变量，不仅仅是已加载的
             - 包含GUI元数据，支持可视化界面开发
             - 数据结构经过标准化，便于外部使用
+            - 结果会被缓存并在多次调用间共享，调用方不应修改返回的列表
         """
+        self._ensure_plugins_discovered()
+        # 插件变量未变化时直接返回上次构建的结果
+        if self._variables_cache is not None:
+            return self._variables_cache
+        
         if not self.available_variables:
             return []
         
         out: List[Dict[str, Any]] = []
 
         for plugin_name, plugin_info in self.available_variables.items():
+            # 以变量名为键的字典按插入顺序去重，同名变量只保留第一次声明
+            unique_variables: Dict[str, Dict[str, Any]] = {}
+            for var in plugin_info.get('variables', ()):
+                unique_variables.setdefault(var['name'], {
+                    "name": var['name'],
+                    "description": var['description'],
+                })
             this_plugin = {
                 "plugin_name": plugin_name,
                 "description": plugin_info.get('description', plugin_name),
-                "variables": [],
+                "variables": list(unique_variables.values()),
                 "gui": plugin_info.get('gui', {})  # 添加GUI元数据
             }
             print(f"[DEBUG Allocator] Preparing gui_info for {plugin_name} to show: {this_plugin['gui']}")
-
-            variables = plugin_info.get('variables', [])
-            if variables:
-                for var in variables:
-                    this_variable = {
-                        "name": var['name'],
-                        "description": var['description'],
-                    }
-                    this_plugin["variables"].append(this_variable)
             out.append(this_plugin)
+        self._variables_cache = out
         return out
 
-    def parse_template_variables(self, template: str) -> Set[str]:
+    def parse_template_variables(self, template: str) -> FrozenSet[str]:
         """
         解析路径模板字符串，提取其中使用的所有变量名
         
@@ -625,17 +965,8 @@ class Allocator:
             - 性能优化：使用编译的正则表达式
             - 处理边界情况，如空模板、无效语法等
         """
-        # 匹配 {变量名} 或 {变量名[索引]} 格式
-        pattern = r'\{([^}]+)\}'
-        matches = re.findall(pattern, template)
-        
-        variables = set()
-        for match in matches:
-            # 处理数组访问格式，如 manual_grouping[0]
-            var_name = match.split('[')[0]
-            variables.add(var_name)
-        
-        return variables
+        # 同一模板会被反复解析（模板切换、临时模板、批量执行），结果已缓存
+        return _parse_template_variables(template)
 
     def update_template(self, template: str) -> None:
         """
@@ -679,97 +1010,127 @@ class Allocator:
             - 支持模板语法验证，无效模板会被拒绝
             - 更新过程中会维护插件状态的一致性
         """
-        old_template = self.current_template
-        old_variables = self.parse_template_variables(old_template) if old_template else set()
-        new_variables = self.parse_template_variables(template)
+        # 模板未变化（如界面重复提交同一模板）时无需任何处理
+        if template == self.current_template and self._compiled_template is not None:
+            return
+        
+        # 旧模板的变量即当前激活的变量，无需重新解析
+        old_variables = self.active_variables
+        new_variables = _parse_template_variables(template)  # 直接取缓存的frozenset
         
         # 找出需要卸载和加载的插件
-        variables_to_unload = old_variables - new_variables
         variables_to_load = new_variables - old_variables
         
-        # 卸载不需要的插件
-        self._unload_plugins_for_variables(variables_to_unload)
+        # 卸载不需要的插件（首次设置模板时没有可卸载的插件）
+        if old_variables:
+            self._unload_plugins_for_variables(old_variables - new_variables)
         
         # 加载需要的插件
         self._load_plugins_for_variables(variables_to_load)
         
-        # 更新当前模板和激活变量
+        # 更新当前模板和激活变量，并预编译模板
         self.current_template = template
         self.active_variables = new_variables
+        self._compiled_template = self._compile_template(template)
+        self._status_cache = None
+        self._format_variables = self._simple_template_variables(self._compiled_template)
+        self._template_renderer = self._build_template_renderer(self._compiled_template)
 
-    def _load_plugins_for_variables(self, variables: Set[str]):
+    def _load_plugins_for_variables(self, variables: FrozenSet[str]):
         """为指定变量加载对应的插件"""
-        plugins_to_load = set()
+        self._ensure_plugins_discovered()
+        # 通过变量索引找出需要加载的插件
+        var_to_plugin = self._var_to_plugin
+        plugins_to_load = {var_to_plugin[variable] for variable in variables if variable in var_to_plugin}
+        plugins_to_load.discard('base_variables')  # 基础变量无需加载插件
+        
+        # 需要导入多个插件时（如首次设置模板或重新加载全部插件），
+        # 先在线程池中并行导入模块，读取文件和编译可以重叠进行；
+        # 函数注册和初始化仍在当前线程中按顺序完成
+        pending_imports = []
+        for plugin_name in plugins_to_load:
+            plugin_info = self.available_variables.get(plugin_name)
+            if plugin_name not in self.loaded_plugins and plugin_info and 'plugin_path' in plugin_info:
+                pending_imports.append((plugin_name, plugin_info['plugin_path']))
         
-        # 找出需要加载的插件
-        for variable in variables:
-            for plugin_name, plugin_info in self.available_variables.items():
-                plugin_variables = [var['name'] for var in plugin_info.get('variables', [])]
-                if variable in plugin_variables:
-                    plugins_to_load.add(plugin_name)
+        failed_imports = set()
+        if len(pending_imports) > 1:
+            def prefetch(item):
+                try:
+                    self._cached_import(*item)
+                    return None
+                except Exception as e:
+                    print(f"插件导入失败: {item[0]} - {e}")
+                    return item[0]
+            
+            with ThreadPoolExecutor(max_workers=min(8, len(pending_imports))) as pool:
+                failed_imports.update(pool.map(prefetch, pending_imports))
         
-        # 加载插件
+        # 加载插件；预导入已失败的插件直接跳过，不再重复抛出并捕获同一个导入错误
         for plugin_name in plugins_to_load:
-            if plugin_name not in self.loaded_plugins:
+            if plugin_name in self.loaded_plugins or plugin_name in failed_imports:
+                continue
+            plugin_info = self.available_variables.get(plugin_name)
+            if not plugin_info or 'plugin_path' not in plugin_info:
+                continue
+            # _load_single_plugin自行捕获并报告加载错误，只有插件自身的初始化函数需要防护
+            self._load_single_plugin(plugin_name, plugin_info['plugin_path'])
+            plugin_record = self.loaded_plugins.get(plugin_name)
+            if plugin_record is not None and plugin_record.init:
                 try:
-                    plugin_info = self.available_variables.get(plugin_name)
-                    if plugin_info and 'plugin_path' in plugin_info:
-                        plugin_path = plugin_info['plugin_path']
-                        self._load_single_plugin(plugin_name, plugin_path)
-                    # 执行初始化函数
-                    if plugin_name in self.init_functions:
-                        self.init_functions[plugin_name]()
-                except Exception:
-                    pass  # 静默处理加载失败
+                    plugin_record.init()
+                except Exception as e:
+                    print(f"插件 {plugin_name} 初始化失败: {e}")
 
-    def _unload_plugins_for_variables(self, variables: Set[str]):
+    def _unload_plugins_for_variables(self, variables: FrozenSet[str]):
         """为指定变量卸载对应的插件"""
-        plugins_to_unload = set()
-        
-        # 找出需要卸载的插件
-        for variable in variables:
-            for plugin_name, plugin_info in self.available_variables.items():
-                plugin_variables = [var['name'] for var in plugin_info.get('variables', [])]
-                if variable in plugin_variables:
-                    # 检查这个插件是否还被其他变量需要
-                    still_needed = False
-                    for other_var in self.active_variables:
-                        if other_var != variable and other_var in plugin_variables:
-                            still_needed = True
-                            break
-                    
-                    if not still_needed:
-                        plugins_to_unload.add(plugin_name)
+        if not variables:
+            return  # 新模板只增加了变量，没有可卸载的插件
+        
+        # 模板中保留下来的变量，其对应插件仍被需要
+        remaining_variables = self.active_variables - variables
+        
+        # 找出需要卸载的插件：移除变量对应的插件中，不再被任何保留变量需要的那些
+        var_to_plugin = self._var_to_plugin
+        still_needed = {var_to_plugin.get(variable) for variable in remaining_variables}
+        plugins_to_unload = {
+            var_to_plugin[variable] for variable in variables if variable in var_to_plugin
+        }
+        plugins_to_unload -= still_needed
+        plugins_to_unload.discard('base_variables')
         
         # 卸载插件
         for plugin_name in plugins_to_unload:
-            if plugin_name in self.loaded_plugins:
+            plugin_record = self.loaded_plugins.get(plugin_name)
+            if plugin_record is None:
+                continue
+            # 调用删除函数，失败时保留插件，与原先的处理一致
+            if plugin_record.delete:
                 try:
-                    # 调用删除函数
-                    if plugin_name in self.delete_functions:
-                        self.delete_functions[plugin_name]()
-                    
-                    # 从已加载插件中移除
-                    del self.loaded_plugins[plugin_name]
-                    if plugin_name in self.execute_functions:
-                        del self.execute_functions[plugin_name]
-                    if plugin_name in self.init_functions:
-                        del self.init_functions[plugin_name]
-                    if plugin_name in self.delete_functions:
-                        del self.delete_functions[plugin_name]
-                        
-                except Exception:
-                    pass  # 静默处理卸载失败
+                    plugin_record.delete()
+                except Exception as e:
+                    print(f"插件 {plugin_name} 清理失败: {e}")
+                    continue
+            
+            # 从已加载插件中移除
+            self.loaded_plugins.pop(plugin_name, None)
+            self._group_plugins.discard(plugin_name)
+            self._status_cache = None
 
     def show_current_status(self) -> str:
-        """显示当前状态信息"""
+        """显示当前状态信息，模板或插件加载状态未变化时直接返回缓存的文本"""
+        self._ensure_plugins_discovered()
+        if self._status_cache is not None:
+            return self._status_cache
+        
         output = ["=== 当前状态 ==="]
         output.append(f"目标目录模板: {self.current_template}")
         output.append(f"激活的变量: {', '.join(sorted(self.active_variables)) if self.active_variables else '无'}")
         output.append(f"已加载的插件: {', '.join(sorted(self.loaded_plugins.keys())) if self.loaded_plugins else '无'}")
         output.append(f"可用插件总数: {len(self.available_variables)}")
         
-        return "\n".join(output)
+        self._status_cache = "\n".join(output)
+        return self._status_cache
 
     def interactive_template_setup(self) -> str:
         """
@@ -855,25 +1216,17 @@ class Allocator:
             print(f"\n完整路径将是: {self.__dest_dir}/您的模板")
             template = input("请输入路径模板 (或输入 'quit' 退出): ").strip()
             
-            if template.lower() == 'quit':
+            # 先比较长度，真实模板通常较长，无需为此生成小写副本
+            if len(template) == 4 and template.lower() == 'quit':
                 return self.current_template
             
             if not template:
                 print("模板不能为空，请重新输入")
                 continue
             
-            # 验证模板中的变量
+            # 验证模板中的变量（变量索引在插件发现时已建立，无需每次重新收集）
             used_variables = self.parse_template_variables(template)
-            unknown_variables = []
-            
-            all_available_vars = set()
-            for plugin_info in self.available_variables.values():
-                for var in plugin_info.get('variables', []):
-                    all_available_vars.add(var['name'])
-            
-            for var in used_variables:
-                if var not in all_available_vars:
-                    unknown_variables.append(var)
+            unknown_variables = sorted(used_variables - self._var_to_plugin.keys())
             
             if unknown_variables:
                 print(f"警告: 以下变量未找到对应插件: {', '.join(unknown_variables)}")
@@ -929,7 +1282,8 @@ class Allocator:
         
         缓存机制：
         - 使用文件绝对路径作为缓存键
-        - 分析结果永久缓存直到手动清理
+        - 文件修改时间或已加载插件变化时缓存失效，重新分析
+        - 插件代码或配置变化时由reload_plugin或调用方通过invalidate_cache清空缓存
         - 支持缓存预热和批量分析
         
         性能考虑：
@@ -947,19 +1301,109 @@ class Allocator:
             - 插件执行失败时对应结果为None
             - 基础文件信息始终可用，不依赖插件
         """
-        if not os.path.exists(filepath):
+        self._ensure_plugins_discovered()
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
             raise FileNotFoundError(f"文件不存在: {filepath}")
         
         filepath = os.path.abspath(filepath)
         
-        # 获取基础文件信息
-        results = self._extract_basic_file_info(filepath)
+        # 文件未修改且插件未变化时直接返回缓存的分析结果
+        file_data = self.file_data
+        cached = file_data.get(filepath)
+        if cached is not None and cached.mtime == file_stat.st_mtime \
+                and cached.plugins == self.loaded_plugins.keys():
+            with self._file_data_lock:
+                if filepath in file_data:
+                    file_data.move_to_end(filepath)
+            return cached.data
+        
+        # 插件集合未变化时所有记录共享同一个frozenset，插件指纹也只在集合变化后重新计算
+        plugins = self._plugins_snapshot
+        if plugins != self.loaded_plugins.keys():
+            plugins = self._plugins_snapshot = frozenset(self.loaded_plugins)
+            self._plugins_fingerprint = None
+        fingerprint = self._plugins_fingerprint
+        if fingerprint is None:
+            fingerprint = self._plugins_fingerprint = self._compute_plugins_fingerprint()
+        
+        # 内存中没有可用结果时查找磁盘缓存（上次运行保存的结果），命中则无需执行插件
+        # 插件代码或配置在两次运行之间被修改时指纹不同，旧结果不会被使用
+        stored = self._read_disk_cache(filepath)
+        if stored is not None and stored['mtime_ns'] == file_stat.st_mtime_ns \
+                and stored['size'] == file_stat.st_size and stored['plugins'] == fingerprint:
+            results = stored['data']
+        else:
+            results = self._run_plugins(filepath, file_stat)
+            self._queue_disk_write(filepath, {
+                'mtime_ns': file_stat.st_mtime_ns,
+                'size': file_stat.st_size,
+                'plugins': fingerprint,
+                'data': results,
+            })
+        
+        # 存储分析结果
+        with self._file_data_lock:
+            file_data[filepath] = FileDataEntry(file_stat.st_mtime, plugins, results)
+            file_data.move_to_end(filepath)
+            if len(file_data) > self._file_data_capacity:
+                file_data.popitem(last=False)
+        
+        return results
+    
+    def _compute_plugins_fingerprint(self) -> tuple:
+        """
+        计算已加载插件的指纹，作为磁盘缓存条目的有效性依据
+        
+        指纹包含每个插件的名称、源文件的修改时间和大小，以及插件目录下
+        配置文件 pluginConfig.yaml 的修改时间（不存在时为None）。
+        插件代码或配置变化后指纹随之变化，磁盘上按旧指纹保存的结果不再命中。
+        
+        Returns:
+            按插件名排序的 (插件名, 源文件mtime_ns, 源文件大小, 配置文件mtime_ns) 元组
+        """
+        fingerprint = []
+        for plugin_name in sorted(self.loaded_plugins):
+            plugin_path = self.loaded_plugins[plugin_name].path
+            try:
+                source_stat = os.stat(plugin_path)
+                source_state = (source_stat.st_mtime_ns, source_stat.st_size)
+            except (OSError, TypeError):
+                source_state = (None, None)
+            try:
+                config_mtime = os.stat(os.path.join(os.path.dirname(plugin_path), 'pluginConfig.yaml')).st_mtime_ns
+            except (OSError, TypeError):
+                config_mtime = None
+            fingerprint.append((plugin_name, *source_state, config_mtime))
+        return tuple(fingerprint)
+    
+    def _run_plugins(self, filepath: str, file_stat: os.stat_result) -> Dict[str, Any]:
+        """
+        对单个文件执行所有已加载插件，返回包含基础文件信息的分析结果
+        
+        Args:
+            filepath: 文件的绝对路径
+            file_stat: 文件的stat结果
+        """
+        # 获取基础文件信息（复用analyze_file中的stat结果）
+        results = self._extract_basic_file_info(filepath, file_stat)
         
         # 执行所有插件的 execute 函数
-        for plugin_name, execute_func in self.execute_functions.items():
+        for plugin_name, plugin_record in self.loaded_plugins.items():
             try:
                 # 调用插件函数
-                plugin_result = execute_func(filepath)
+                plugin_result = plugin_record.execute(filepath)
+                
+                # 分组名、日期、大小分类等短字符串在大量文件间重复，驻留后共享同一对象
+                if isinstance(plugin_result, str):
+                    if len(plugin_result) < 64:
+                        plugin_result = sys.intern(plugin_result)
+                elif isinstance(plugin_result, list):
+                    plugin_result = [
+                        sys.intern(item) if isinstance(item, str) and len(item) < 64 else item
+                        for item in plugin_result
+                    ]
                 
                 # 存储结果
                 if plugin_result is not None:
@@ -968,11 +1412,124 @@ class Allocator:
             except Exception:
                 results[plugin_name] = None
         
-        # 存储分析结果
-        self.file_data[filepath] = results
-        
         return results
     
+    def _read_disk_cache(self, filepath: str) -> Optional[Dict[str, Any]]:
+        """从磁盘缓存读取文件上次的分析结果，第一次调用时打开缓存文件"""
+        with self._file_data_lock:
+            pending = self._pending_disk_writes.get(filepath)
+            if pending is not None:
+                return pending
+            
+            disk_cache = self._disk_cache
+            if disk_cache is None:
+                disk_cache = self._disk_cache = self._open_disk_cache()
+            if disk_cache is False:
+                return None
+            
+            try:
+                return disk_cache.get(filepath)
+            except Exception:
+                return None  # 缓存条目损坏或无法反序列化时视为未命中
+    
+    def _open_disk_cache(self) -> Union[shelve.Shelf, bool]:
+        """
+        以独占方式打开磁盘缓存
+        
+        dbm.dumb等后端没有进程间锁，多个进程同时打开同一缓存会损坏数据。
+        先对同名的.lock文件加排他锁，取得锁后才打开缓存；缓存目录无法创建、
+        锁已被其他进程持有或缓存无法打开时返回False，本次运行只使用内存缓存。
+        调用方需持有_file_data_lock。
+        """
+        cache_path = self._disk_cache_path
+        try:
+            os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+            lock_file = _lock_file_exclusive(cache_path + '.lock')
+        except OSError as e:
+            print(f"无法创建分析结果缓存 {cache_path}，仅使用内存缓存: {e}")
+            return False
+        if lock_file is None:
+            print(f"分析结果缓存 {cache_path} 正被其他进程使用，仅使用内存缓存")
+            return False
+        
+        try:
+            disk_cache = shelve.open(cache_path)
+        except Exception as e:
+            _unlock_file(lock_file)
+            print(f"无法打开分析结果缓存 {cache_path}，仅使用内存缓存: {e}")
+            return False
+        self._disk_cache_lock = lock_file
+        return disk_cache
+    
+    def close_cache(self) -> None:
+        """
+        写入尚未保存的分析结果，关闭磁盘缓存并释放其排他锁
+        
+        之后再次分析文件时会重新打开磁盘缓存。
+        """
+        self.flush_cache()
+        with self._file_data_lock:
+            if isinstance(self._disk_cache, shelve.Shelf):
+                try:
+                    self._disk_cache.close()
+                except Exception:
+                    pass
+            self._disk_cache = None
+            if self._disk_cache_lock is not None:
+                _unlock_file(self._disk_cache_lock)
+                self._disk_cache_lock = None
+    
+    def _queue_disk_write(self, filepath: str, entry: Dict[str, Any]) -> None:
+        """记录待写入磁盘缓存的分析结果，积累到一定数量后批量写入"""
+        if self._disk_cache is False:
+            return
+        with self._file_data_lock:
+            self._pending_disk_writes[filepath] = entry
+            should_flush = len(self._pending_disk_writes) >= 256
+        if should_flush:
+            self.flush_cache()
+    
+    def flush_cache(self) -> None:
+        """
+        将尚未保存的分析结果写入磁盘缓存
+        
+        分析结果先在内存中积累，达到一定数量或调用cleanup时批量写入，
+        避免每分析一个文件就写一次磁盘。无法序列化的结果会被跳过。
+        """
+        with self._file_data_lock:
+            disk_cache = self._disk_cache
+            pending, self._pending_disk_writes = self._pending_disk_writes, {}
+            if not pending or not isinstance(disk_cache, shelve.Shelf):
+                return
+            for filepath, entry in pending.items():
+                try:
+                    disk_cache[filepath] = entry
+                except Exception:
+                    pass  # 插件返回了无法pickle的结果，该文件不写入磁盘缓存
+            try:
+                disk_cache.sync()
+            except Exception as e:
+                print(f"写入分析结果缓存失败: {e}")
+    
+    def invalidate_cache(self) -> None:
+        """
+        丢弃所有已缓存的分析结果（内存和磁盘）
+        
+        缓存只在文件修改或已加载插件集合变化时自动失效。插件的代码或配置
+        发生变化（例如在插件配置对话框中修改了分组规则）时，旧结果不再有效，
+        需要调用此方法使下次分析重新执行插件。
+        """
+        with self._file_data_lock:
+            self.file_data.clear()
+            self._pending_disk_writes.clear()
+            self._plugins_fingerprint = None  # 插件配置文件可能已修改，下次分析时重新计算
+            if isinstance(self._disk_cache, shelve.Shelf):
+                try:
+                    self._disk_cache.clear()
+                    self._disk_cache.sync()
+                except Exception as e:
+                    print(f"清空分析结果缓存失败: {e}")
+    
     def analyze_batch(self, filepaths: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         批量分析文件
@@ -982,17 +1539,23 @@ class Allocator:
             
         Returns:
             分析结果字典，键为文件路径，值为分析结果
+            
+        Note:
+            插件分析以文件I/O为主，与batch_execute共用同一个线程池并行处理，
+            结果字典仍按输入顺序排列。
         """
-        batch_results = {}
+        self._ensure_plugins_discovered()  # 在提交任务前完成插件发现，避免在工作线程中扫描
+        if not filepaths:
+            return {}
         
-        for filepath in filepaths:
+        def analyze_safe(filepath: str) -> Dict[str, Any]:
             try:
-                results = self.analyze_file(filepath)
-                batch_results[filepath] = results
-                
+                return self.analyze_file(filepath)
             except Exception as e:
-                batch_results[filepath] = {'error': str(e)}
+                return {'error': str(e)}
         
+        batch_results = dict(zip(filepaths, self._get_executor().map(analyze_safe, filepaths)))
+        self.flush_cache()
         return batch_results
     
     def get_file_groups(self, filepath: str) -> List[str]:
@@ -1005,21 +1568,20 @@ class Allocator:
         Returns:
             分组列表
         """
-        if filepath not in self.file_data:
-            self.analyze_file(filepath)
-        
-        file_data = self.file_data[filepath]
+        file_data = self.analyze_file(filepath)
         groups = []
         
-        # 从各个插件结果中提取分组信息
+        # 按插件结果顺序提取分组信息，分组插件集合在加载/卸载时维护
+        group_plugins = self._group_plugins
         for plugin_name, result in file_data.items():
-            if plugin_name.endswith('_group') or plugin_name.endswith('_grouping'):
-                if isinstance(result, list):
-                    groups.extend(result)
-                elif isinstance(result, str):
-                    groups.append(result)
+            if plugin_name not in group_plugins:
+                continue
+            if isinstance(result, list):
+                groups.extend(result)
+            elif isinstance(result, str):
+                groups.append(result)
         
-        return list(set(groups))  # 去重
+        return list(dict.fromkeys(groups))  # 按出现顺序去重，第一个分组即primary_group
     
     def generate_target_paths(self, filepath: str, target_patterns: List[str]) -> List[str]:
         """
@@ -1030,25 +1592,15 @@ class Allocator:
             target_patterns: 目标路径模式列表
             
         Returns:
-            生成的目标路径列表
+            生成的目标路径列表，与execute相同，已清理并添加目标目录前缀
+            
+        Note:
+            路径模式与update_template的模板语法相同，支持数组下标和默认值；
+            缺失的变量按模板规则保留占位符，不再跳过整个模式
         """
-        if filepath not in self.file_data:
-            self.analyze_file(filepath)
-        
-        file_data = self.file_data[filepath]
-        target_paths = []
-        
-        for pattern in target_patterns:
-            try:
-                # 使用文件数据格式化路径模式
-                formatted_path = pattern.format(**file_data)
-                target_paths.append(formatted_path)
-            except KeyError:
-                pass  # 静默处理变量缺失
-            except Exception:
-                pass  # 静默处理格式化错误
-        
-        return target_paths
+        file_data = self.analyze_file(filepath)
+        resolve = self._resolve_template_variables
+        return [resolve(pattern, file_data) for pattern in target_patterns]
     
     def cleanup(self) -> None:
         """
@@ -1086,14 +1638,23 @@ class Allocator:
             - 此方法应该在程序结束前调用
             - 支持多次调用，不会产生副作用
         """
-        for plugin_name, delete_func in self.delete_functions.items():
+        for plugin_record in self.loaded_plugins.values():
+            if plugin_record.delete is None:
+                continue
             try:
-                delete_func()
+                plugin_record.delete()
             except Exception:
                 pass  # 静默处理清理失败
         
-        # 清空数据
+        # 保存尚未写入的分析结果并关闭磁盘缓存，然后清空内存数据
+        self.close_cache()
         self.file_data.clear()
+        
+        # 关闭批量处理线程池
+        with self._file_data_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
     
     def __del__(self):
         """析构函数，自动清理资源"""
@@ -1102,23 +1663,37 @@ class Allocator:
         except:
             pass
     
-    def _extract_basic_file_info(self, filepath: str) -> Dict[str, Any]:
-        """提取基础文件信息"""
-        filename = os.path.basename(filepath)
-        basename, extension = os.path.splitext(filename)
-        ext = extension[1:] if extension.startswith('.') else extension  # 移除点号
+    def _extract_basic_file_info(self, filepath: str, file_stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """提取基础文件信息，file_stat为已获取的os.stat结果，避免重复系统调用"""
+        if file_stat is None:
+            try:
+                file_stat = os.stat(filepath)
+            except OSError:
+                file_stat = None
+        
+        # analyze_file传入的已是标准化的绝对路径，无需再次abspath；其余部分用字符串切分得到
+        abs_path = filepath if os.path.isabs(filepath) else os.path.abspath(filepath)
+        slash = abs_path.rfind(os.sep)
+        filename = abs_path[slash + 1:]
+        
+        # 与os.path.splitext一致：开头的点（如 .bashrc）不视为扩展名
+        dot = filename.rfind('.')
+        if dot > 0 and filename[:dot].strip('.'):
+            basename, extension = filename[:dot], sys.intern(filename[dot:])
+        else:
+            basename, extension = filename, ''
         
         return {
-            'filepath': os.path.abspath(filepath),
+            'filepath': abs_path,
             'filename': filename,
             'basename': basename,
             'extension': extension,  # 包含点号的扩展名
-            'ext': ext,  # 不含点号的扩展名
-            'dirname': os.path.dirname(filepath),
-            'filesize': os.path.getsize(filepath) if os.path.isfile(filepath) else 0
+            'ext': sys.intern(extension[1:]),  # 不含点号的扩展名
+            'dirname': abs_path[:slash] or os.sep,
+            'filesize': file_stat.st_size if file_stat is not None and stat.S_ISREG(file_stat.st_mode) else 0
         }
     
-    def _resolve_template_variables(self, template: str, variables: Dict[str, Any]) -> str:
+    def _resolve_template_variables(self, template: str, variables: Mapping[str, Any]) -> str:
         """
         智能解析模板变量，支持数组下标、默认值等高级语法特性
         
@@ -1141,12 +1716,11 @@ class Allocator:
         3. 默认值：{variable:default} → 变量值或默认值
         4. 组合语法：{array[0]:default} → 数组元素或默认值
         
-        解析步骤（按优先级顺序）：
-        1. 处理数组+默认值组合：{array[0]:default}
-        2. 处理纯数组访问：{array[0]}
-        3. 处理变量+默认值：{variable:default}
-        4. 处理基础变量：{variable}
-        5. 清理和标准化路径
+        解析步骤：
+        1. 不含占位符的模板直接跳过替换
+        2. 当前模板使用update_template时生成的渲染函数
+        3. 临时模板首次使用合并正则一次替换全部占位符，重复使用时改用缓存的渲染函数
+        4. 清理和标准化路径
         
         容错处理：
         - 数组越界：返回"unknown"或使用默认值
@@ -1176,66 +1750,77 @@ class Allocator:
             - 支持嵌套路径和复杂目录结构
             - 生成的路径保证在目标目录下
         """
-        import re
-        
-        result = template
+        if '{' not in template:
+            # 不含占位符的模板无需任何替换，直接清理并添加前缀
+            result = template
+        elif self._format_variables is not None and template == self.current_template:
+            # 最快路径：只含{variable}的简单模板直接交给str.format_map
+            format_values = _SafeFormatDict()
+            for var_name in self._format_variables:
+                if var_name in variables:
+                    value = variables[var_name]
+                    format_values[var_name] = "" if value is None or (isinstance(value, (str, list, tuple)) and not value) else value
+            result = template.format_map(format_values)
+        elif self._template_renderer is not None and template == self.current_template:
+            # 快速路径：当前模板已在update_template中生成专用的渲染函数
+            result = self._template_renderer(variables)
+        else:
+            # 临时模板：第一次出现时直接用正则替换；同一临时模板再次出现（如batch_execute
+            # 对每个文件使用同一模板）时为其生成渲染函数并缓存，之后与当前模板一样快速渲染
+            renderers = self._temporary_renderers
+            renderer = renderers.get(template, _MISSING)
+            if renderer is _MISSING:
+                if len(renderers) >= 32:
+                    renderers.clear()  # 简单限制缓存大小，clear是原子操作，多线程下也安全
+                renderers[template] = None
+                result = self._substitute_template_variables(template, variables)
+            else:
+                if renderer is None:
+                    renderer = self._build_template_renderer(self._compile_template(template))
+                    renderers[template] = renderer
+                result = renderer(variables)
         
-        # 第一步：处理数组访问+默认值的组合，如 {manual_grouping[1]:default-group}
-        array_default_pattern = re.compile(r'\{(\w+)\[(\d+)\]:([^}]+)\}')
+        # 清理路径中的空段和连续分隔符
+        result = self._clean_path_segments(result)
         
-        def replace_array_with_default(match):
-            var_name = match.group(1)
-            index = int(match.group(2))
-            default_value = match.group(3)
-            
-            if var_name in variables:
-                var_value = variables[var_name]
-                if isinstance(var_value, list) and 0 <= index < len(var_value):
-                    return str(var_value[index])
-                else:
-                    return default_value  # 索引超出范围，使用默认值
-            else:
-                return default_value  # 变量不存在，使用默认值
+        # 添加目标文件夹前缀生成完整路径
+        # 等价于os.path.join(self.__dest_dir, result)：绝对路径保持不变，相对路径直接拼接预先构建的前缀
+        if not result.startswith(self.__dest_dir) and not result.startswith('/'):
+            result = self._dest_prefix + result
         
-        result = array_default_pattern.sub(replace_array_with_default, result)
+        return result
+    
+    def _substitute_template_variables(self, template: str, variables: Mapping[str, Any]) -> str:
+        """
+        使用一次正则替换解析模板中的全部变量占位符
         
-        # 第二步：处理普通数组访问，如 {manual_grouping[0]}
-        array_pattern = re.compile(r'\{(\w+)\[(\d+)\]\}')
+        用于未经预编译的临时模板，替换规则与_build_template_renderer生成的函数一致。
+        四种语法由同一个合并正则匹配，在回调中按匹配到的分组分别处理。
         
-        def replace_array_access(match):
-            var_name = match.group(1)
-            index = int(match.group(2))
+        Args:
+            template: 包含变量占位符的路径模板
+            variables: 可用变量的值字典
             
-            if var_name in variables:
-                var_value = variables[var_name]
+        Returns:
+            替换后的路径字符串（未清理、未添加目标目录前缀）
+        """
+        def replace_variable(match):
+            var_name, index, default_value = match.groups()
+            
+            # 数组访问，如 {manual_grouping[0]} 或 {manual_grouping[1]:default-group}
+            if index is not None:
+                var_value = variables.get(var_name)
+                index = int(index)
                 if isinstance(var_value, list) and 0 <= index < len(var_value):
                     return str(var_value[index])
-                else:
-                    return "unknown"  # 索引超出范围
-            else:
-                return "unknown"  # 变量不存在
-        
-        result = array_pattern.sub(replace_array_access, result)
-        
-        # 第三步：处理普通变量+默认值，如 {variable:default_value}
-        default_pattern = re.compile(r'\{(\w+):([^}]+)\}')
-        
-        def replace_with_default(match):
-            var_name = match.group(1)
-            default_value = match.group(2)
+                return default_value if default_value is not None else "unknown"  # 索引超出范围或变量不存在
             
-            if var_name in variables and variables[var_name]:
-                return str(variables[var_name])
-            else:
-                return default_value
-        
-        result = default_pattern.sub(replace_with_default, result)
-        
-        # 第四步：处理普通变量替换，如 {variable}
-        normal_pattern = re.compile(r'\{(\w+)\}')
-        
-        def replace_normal_variable(match):
-            var_name = match.group(1)
+            # 普通变量+默认值，如 {variable:default_value}
+            if default_value is not None:
+                var_value = variables.get(var_name)
+                return str(var_value) if var_value else default_value
+            
+            # 普通变量，如 {variable}
             if var_name in variables:
                 value = variables[var_name]
                 # 如果值为None、空字符串或其他假值，返回空字符串
@@ -1245,19 +1830,129 @@ class Allocator:
                     return ""
                 else:
                     return str(value)
+            return f"{{{var_name}}}"  # 保留未找到的变量
+        
+        return _TEMPLATE_TOKEN_RE.sub(replace_variable, template)
+    
+    def _compile_template(self, template: str) -> List[tuple]:
+        """
+        将模板预先解析为操作码列表，供批量生成路径时重复使用
+        
+        模板在update_template时解析一次，之后每个文件只需按顺序查表拼接，
+        无需再对模板执行正则替换。
+        
+        Args:
+            template: 路径模板字符串
+            
+        Returns:
+            操作码列表，元素为以下三种元组之一：
+            - ('lit', text): 原样输出的文本
+            - ('var', name, default): 变量，default为None表示无默认值
+            - ('idx', name, index, default): 数组下标访问
+            
+        Example:
+            >>> self._compile_template("{groups[0]:Others}/{basename}")
+            [('idx', 'groups', 0, 'Others'), ('lit', '/'), ('var', 'basename', None)]
+        """
+        tokens: List[tuple] = []
+        position = 0
+        
+        for match in _TEMPLATE_TOKEN_RE.finditer(template):
+            if match.start() > position:
+                tokens.append(('lit', template[position:match.start()]))
+            
+            var_name, index, default_value = match.groups()
+            if index is not None:
+                tokens.append(('idx', var_name, int(index), default_value))
             else:
-                return f"{{{var_name}}}"  # 保留未找到的变量
+                tokens.append(('var', var_name, default_value))
+            position = match.end()
         
-        result = normal_pattern.sub(replace_normal_variable, result)
+        if position < len(template):
+            tokens.append(('lit', template[position:]))
         
-        # 第五步：清理路径中的空段和连续分隔符
-        result = self._clean_path_segments(result)
+        return tokens
+    
+    def _simple_template_variables(self, tokens: List[tuple]) -> Optional[tuple]:
+        """
+        判断预编译的模板能否直接使用 str.format_map 渲染
         
-        # 添加目标文件夹前缀生成完整路径
-        if not result.startswith(self.__dest_dir):
-            result = os.path.join(self.__dest_dir, result)
+        只有所有占位符都是不带下标和默认值的{variable}，
+        且文本部分不含花括号时，模板才算"简单模板"。
         
-        return result
+        Args:
+            tokens: _compile_template生成的操作码列表
+            
+        Returns:
+            简单模板引用的变量名元组，否则返回None
+        """
+        names = []
+        for token in tokens:
+            if token[0] == 'lit':
+                if '{' in token[1] or '}' in token[1]:
+                    return None
+            elif token[0] == 'var' and token[2] is None and not token[1].isdigit():
+                names.append(token[1])
+            else:
+                return None
+        return tuple(dict.fromkeys(names))
+    
+    def _build_template_renderer(self, tokens: List[tuple]) -> Callable[[Mapping[str, Any]], str]:
+        """
+        根据预编译的操作码列表生成当前模板专用的渲染函数
+        
+        模板在update_template后固定下来，随后会对大量文件重复渲染。
+        将操作码展开成一个直线执行的函数后，每个文件只需一次函数调用，
+        无需再逐个解释操作码。变量名只由字母、数字和下划线组成，所有常量都经repr写入源码。
+        
+        替换规则与_substitute_template_variables保持一致：
+        - 数组越界或变量不存在时使用默认值，无默认值则为"unknown"
+        - 带默认值的变量在值为空时使用默认值
+        - 普通变量值为空时替换为空字符串，变量不存在时保留占位符
+        
+        Args:
+            tokens: _compile_template生成的操作码列表
+            
+        Returns:
+            接收变量字典、返回替换后路径字符串（未清理、未添加目标目录前缀）的函数
+            
+        Example:
+            >>> render = self._build_template_renderer([('lit', 'Docs/'), ('var', 'basename', None)])
+            >>> render({'basename': 'report'})
+            'Docs/report'
+        """
+        parts: List[str] = []
+        for position, token in enumerate(tokens):
+            kind = token[0]
+            if kind == 'lit':
+                parts.append(repr(token[1]))
+            elif kind == 'idx':
+                _, var_name, index, default_value = token
+                fallback = default_value if default_value is not None else "unknown"
+                parts.append(
+                    f"str(v{position}[{index}]) if isinstance((v{position} := get({var_name!r})), list) "
+                    f"and {index} < len(v{position}) else {fallback!r}"
+                )
+            else:
+                _, var_name, default_value = token
+                if default_value is not None:
+                    parts.append(f"str(v{position}) if (v{position} := get({var_name!r})) else {default_value!r}")
+                else:
+                    parts.append(
+                        f"_plain_template_value(variables[{var_name!r}]) if {var_name!r} in variables "
+                        f"else {'{' + var_name + '}'!r}"
+                    )
+        
+        source = (
+            "def render(variables):\n"
+            "    get = variables.get\n"
+            "    return ''.join((\n"
+            + "".join(f"        {part},\n" for part in parts)
+            + "    ))\n"
+        )
+        namespace = {'_plain_template_value': _plain_template_value}
+        exec(compile(source, '<path template>', 'exec'), namespace)
+        return namespace['render']
     
     def _clean_path_segments(self, path: str) -> str:
         """
@@ -1269,18 +1964,14 @@ class Allocator:
         Returns:
             清理后的路径
         """
-        # 分割路径段
-        segments = []
-        for segment in path.split('/'):
-            # 跳过空段和只含空白字符的段
-            if segment and segment.strip():
-                segments.append(segment.strip())
+        # 一次替换合并连续分隔符并去掉分隔符两侧的空白（即移除空段和只含空白的段），
+        # 再去掉首尾的空白和分隔符
+        cleaned = _PATH_SEPARATOR_RE.sub('/', path).strip().strip('/')
         
-        # 重新拼接，确保开头的斜杠得到保留
+        # 确保开头的斜杠得到保留
         if path.startswith('/'):
-            return '/' + '/'.join(segments)
-        else:
-            return '/'.join(segments)
+            return '/' + cleaned
+        return cleaned
 
     def execute(self, filepath: str, target_template: Optional[str] = None) -> str:
         """
@@ -1340,28 +2031,33 @@ class Allocator:
             template_vars = self.parse_template_variables(target_template)
             self._load_plugins_for_variables(template_vars)
         
-        # 获取基础文件信息
-        basic_info = self._extract_basic_file_info(filepath)
+        return self._render_target_path(filepath, target_template)
+    
+    def _render_target_path(self, filepath: str, target_template: str) -> str:
+        """
+        分析文件并按模板生成目标路径，调用前模板所需的插件必须已经加载
         
-        # 分析文件（执行插件）
+        batch_execute在提交任务前统一加载插件，工作线程直接调用本方法，
+        不必对每个文件重复检查模板和插件。
+        """
+        # 分析文件（执行插件），结果中已包含基础文件信息
         analysis_result = self.analyze_file(filepath)
         
-        # 合并所有变量
-        all_variables = basic_info.copy()
-        all_variables.update(analysis_result)
-        
         # 构建扩展变量
         groups = analysis_result.get('manual_grouping', [])
         primary_group = groups[0] if groups else 'Others'
         
-        # 添加便捷变量
-        all_variables.update({
+        # 便捷变量
+        extras = {
             'primary_group': primary_group,
             'groups': groups,
             'size_category': analysis_result.get('file_size_classifier', 'unknown'),
             'file_date': analysis_result.get('file_date_read', ''),
             'manual_grouping': groups,  # 确保manual_grouping可用
-        })
+        }
+        
+        # 合并所有变量：ChainMap只引用各字典，不复制，也不会修改缓存的分析结果
+        all_variables = ChainMap(extras, analysis_result)
         
         # 智能解析目标路径并返回
         return self._resolve_template_variables(target_template, all_variables)
@@ -1375,19 +2071,49 @@ class Allocator:
             target_template: 目标路径模板，如果为None则使用当前模板
             
         Returns:
-            目标路径字符串列表
+            目标路径字符串列表，顺序与filepaths一致
+            
+        Note:
+            插件分析以文件I/O为主，多个文件在线程池中并行处理。
+            模板所需的插件在提交任务前统一加载，避免在工作线程中修改插件状态。
         """
-        results = []
+        self._ensure_plugins_discovered()
+        if not filepaths:
+            return []
+        
+        # 使用当前模板或指定模板，并在主线程中确保所需插件已加载
+        if target_template is None:
+            target_template = self.current_template
+        elif target_template != self.current_template:
+            self._load_plugins_for_variables(self.parse_template_variables(target_template))
         
-        for filepath in filepaths:
+        def execute_safe(filepath: str) -> str:
             try:
-                target_path = self.execute(filepath, target_template)
-                results.append(target_path)
+                return self._render_target_path(filepath, target_template)
             except Exception as e:
                 # 对于出错的文件，添加错误标记或跳过
-                results.append(f"ERROR: {filepath} - {str(e)}")
+                return f"ERROR: {filepath} - {str(e)}"
         
-        return results
+        target_paths = list(self._get_executor().map(execute_safe, filepaths))
+        self.flush_cache()
+        return target_paths
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        返回批量处理共用的线程池，第一次使用时创建
+        
+        插件执行以stat和读取文件等I/O为主，线程大部分时间在等待I/O，
+        因此线程数取CPU核数的4倍（最多32个）。创建过程加锁，
+        避免多个线程同时首次调用时各自创建线程池而泄漏其中一个。
+        """
+        executor = self._executor
+        if executor is None:
+            with self._file_data_lock:
+                executor = self._executor
+                if executor is None:
+                    executor = self._executor = ThreadPoolExecutor(
+                        max_workers=min(32, (os.cpu_count() or 1) * 4))
+        return executor
     
     def unload_plugin(self, plugin_name: str) -> bool:
         """
@@ -1399,32 +2125,26 @@ class Allocator:
         Returns:
             bool: 卸载成功返回True，失败返回False
         """
-        if plugin_name not in self.loaded_plugins:
+        plugin_record = self.loaded_plugins.get(plugin_name)
+        if plugin_record is None:
             return False
         
         try:
             # 1. 调用插件的delete清理函数（如果存在）
-            if plugin_name in self.delete_functions:
-                self.delete_functions[plugin_name]()
+            if plugin_record.delete:
+                plugin_record.delete()
             
-            # 2. 从所有管理字典中移除插件信息
+            # 2. 移除插件记录（模块和所有注册函数）及变量信息
             self.loaded_plugins.pop(plugin_name, None)
-            self.init_functions.pop(plugin_name, None)
-            self.execute_functions.pop(plugin_name, None)
-            self.delete_functions.pop(plugin_name, None)
-            self.reload_functions.pop(plugin_name, None)
+            self._group_plugins.discard(plugin_name)
+            self._status_cache = None
             self.available_variables.pop(plugin_name, None)
+            self._unindex_plugin_variables(plugin_name)
             
-            # 3. 从sys.modules中移除插件模块，允许重新加载
-            # 插件可能以多种方式被加载，需要检查多种可能的模块名
-            possible_module_names = [
-                plugin_name,
-                f"module.plugins.{plugin_name}",
-                f"plugins.{plugin_name}"
-            ]
-            for name in possible_module_names:
-                if name in sys.modules:
-                    del sys.modules[name]
+            # 3. 从sys.modules中移除插件模块及其子模块，允许重新加载
+            # 使用导入时记录的模块名，未记录时只移除插件自身
+            for name in self._plugin_modules.pop(plugin_name, (plugin_name,)):
+                sys.modules.pop(name, None)
             
             print(f"插件 {plugin_name} 已成功卸载。")
             return True
@@ -1432,30 +2152,49 @@ class Allocator:
             print(f"卸载插件 {plugin_name} 时出错: {e}")
             return False
 
-    def reload_plugins(self) -> None:
+    def reload_plugins(self) -> Dict[str, bool]:
         """
         重新加载所有插件
         
         该方法会先卸载所有当前已加载的插件，然后重新扫描插件目录并加载。
         这对于在运行时添加、删除或修改插件文件后更新整个系统非常有用。
+        
+        Returns:
+            重载前已加载的每个插件是否重新加载成功，键为插件名
         """
         print("正在重新加载所有插件...")
         
         # 卸载所有现有插件
-        # 使用list(self.loaded_plugins.keys())来避免在迭代时修改字典
-        for plugin_name in list(self.loaded_plugins.keys()):
+        # 先取插件名的元组快照，避免在迭代时修改字典
+        previously_loaded = tuple(self.loaded_plugins)
+        for plugin_name in previously_loaded:
             self.unload_plugin(plugin_name)
         
-        # 清空变量并重新注册基础变量
-        self.available_variables.clear()
-        self._register_base_variables()
-        
-        # 重新发现和加载插件
-        self._discover_plugin_variables()
-        self._load_plugins()
+        # 只在发现阶段导入过、从未加载的插件不会经过unload_plugin，
+        # 它们的模块仍留在sys.modules中，一次遍历按名称前缀统一移除
+        stale_names = set(self.discovered_modules)
+        if stale_names:
+            prefixes = tuple(name + '.' for name in stale_names)
+            for module_name in [m for m in sys.modules.keys() if m in stale_names or m.startswith(prefixes)]:
+                sys.modules.pop(module_name, None)
+            for name in stale_names:
+                self._plugin_modules.pop(name, None)
+        
+        # 清空模块缓存，使插件文件的修改生效
+        # 导入失败记录保留：文件修改后记录自动作废，未修改的失败插件不再重复导入
+        self.discovered_modules.clear()
+        
+        # 插件代码可能已变化，丢弃旧代码产生的分析结果（与reload_plugin相同）
+        self.invalidate_cache()
+        
+        # 重新发现插件（同时重建变量索引），并加载当前模板需要的插件
+        self._plugins_discovered = True
+        self._scan_and_load_plugins()
         self._execute_init_functions()
+        self._load_plugins_for_variables(self.active_variables)
         
         print("所有插件重新加载完成。")
+        return {plugin_name: plugin_name in self.loaded_plugins for plugin_name in previously_loaded}
 
     def reload_plugin(self, plugin_name: str) -> bool:
         """
@@ -1467,33 +2206,91 @@ class Allocator:
         Returns:
             bool: 重载成功返回True，失败返回False
         """
-        if plugin_name not in self.loaded_plugins:
+        self._ensure_plugins_discovered()
+        plugin_name = sys.intern(plugin_name)
+        plugin_record = self.loaded_plugins.get(plugin_name)
+        plugin_path = plugin_record.path if plugin_record else self.available_variables.get(plugin_name, {}).get('plugin_path')
+        
+        # 上次重载失败且文件未修改，重新执行注定失败，直接跳过（插件状态保持不变）
+        if plugin_path and self._import_failed_unchanged(plugin_path):
+            print(f"跳过重载插件 {plugin_name}: 上次导入失败且文件未修改。")
+            return False
+        
+        if plugin_record is None:
+            # 已发现但尚未用到的插件没有导入过，只需刷新其变量元数据，首次使用时再导入
+            if plugin_path and plugin_name not in self.discovered_modules:
+                self._discover_single_plugin_variables(plugin_name, plugin_path)
+                return plugin_name in self.available_variables
             print(f"无法重载插件 {plugin_name}: 插件未加载。")
             return False
         
-        plugin_path = self.loaded_plugins[plugin_name].get('path')
-        if not plugin_path or not os.path.exists(plugin_path):
+        # 插件路径在加载时已验证存在，这里不再重复stat，只有重新加载失败时才检查
+        if not plugin_path:
             print(f"无法重载插件 {plugin_name}: 找不到源文件路径。")
             return False
             
         print(f"正在重载插件: {plugin_name}")
         
-        # 卸载旧插件
-        if not self.unload_plugin(plugin_name):
-            print(f"重载失败：卸载插件 {plugin_name} 失败。")
-            return False
+        # 先让旧插件清理自身状态
+        if plugin_record.delete:
+            try:
+                plugin_record.delete()
+            except Exception as e:
+                print(f"重载失败：执行插件 {plugin_name} 的清理函数时出错: {e}")
+                return False
+        
+        # 优先原地重新执行模块代码（与importlib.reload相同的做法），复用模块对象和已解析的spec。
+        # 插件通过文件路径加载，不在sys.path中，importlib.reload无法重新查找spec，因此直接调用loader
+        plugin_module = plugin_record.module
+        spec = getattr(plugin_module, '__spec__', None)
+        reloaded = False
+        if spec is not None and spec.loader is not None:
+            try:
+                sys.modules[spec.name] = plugin_module
+                spec.loader.exec_module(plugin_module)
+                
+                new_record = PluginRecord(module=plugin_module, path=plugin_path)
+                self._register_plugin_functions(plugin_name, plugin_module, new_record)
+                if new_record.execute:
+                    self.loaded_plugins[plugin_name] = new_record
+                    reloaded = True
+            except Exception as e:
+                print(f"原地重载插件 {plugin_name} 失败，改为从文件重新导入: {e}")        
+        if not reloaded:
+            # 回退：丢弃旧模块的所有引用后从文件重新导入
+            self.loaded_plugins.pop(plugin_name, None)
+            self._group_plugins.discard(plugin_name)
+            self.discovered_modules.pop(plugin_name, None)
+            for name in self._plugin_modules.pop(plugin_name, (plugin_name,)):
+                sys.modules.pop(name, None)
             
-        # 加载新插件
-        try:
+            # _load_single_plugin自行处理并报告加载错误，这里只检查结果
             self._load_single_plugin(plugin_name, plugin_path)
-            # 执行初始化
-            if plugin_name in self.init_functions:
-                self.init_functions[plugin_name]()
-            print(f"插件 {plugin_name} 重载成功。")
-            return True
-        except Exception as e:
-            print(f"重载失败：加载插件 {plugin_name} 时出错: {e}")
+        
+        self._status_cache = None
+        plugin_record = self.loaded_plugins.get(plugin_name)
+        if plugin_record is None:
+            if not os.path.exists(plugin_path):
+                print(f"重载失败：找不到插件 {plugin_name} 的源文件: {plugin_path}")
+            else:
+                print(f"重载失败：插件 {plugin_name} 未能重新加载。")
             return False
+        
+        # 插件代码已变化：重新登记其变量，并丢弃旧代码产生的分析结果
+        self._discover_single_plugin_variables(plugin_name, plugin_path)
+        self.invalidate_cache()
+        
+        # 依次执行插件的初始化和重载函数（存在时），只有插件自身的代码需要防护
+        for hook in (plugin_record.init, plugin_record.reload):
+            if hook:
+                try:
+                    hook()
+                except Exception as e:
+                    print(f"重载失败：执行插件 {plugin_name} 的 {hook.__name__} 时出错: {e}")
+                    return False
+        
+        print(f"插件 {plugin_name} 重载成功。")
+        return True
     
     # def _add_special_plugin_variables(self, plugin_name: str, plugin_module, variables: Dict[str, Any], added_variables: set):
     #     """添加特殊插件变量和描述"""
@@ -1593,32 +2390,3 @@ def create_allocator(target_folder: str, plugins_dir: Optional[str] = None) -> A
     """
     return Allocator(target_folder, plugins_dir)
 
-
-# ==================== 模块主程序 ====================
-
-if __name__ == "__main__":
-    """
-    模块测试和演示程序
-    
-    当直接运行此模块时，会执行基本的功能演示，
-    展示插件发现、变量列表和系统状态等核心功能。
-    """
-    # 创建测试用的分类器实例
-    allocator = create_allocator("/tmp/test")
-    
-    print("=" * 60)
-    print("文件分类器核心模块演示")
-    print("=" * 60)
-    
-    print("\n=== 插件变量发现演示 ===")
-    variables_info = allocator.show_available_variables()
-    for plugin_info in variables_info:
-        print(f"\n插件: {plugin_info['plugin_name']}")
-        print(f"描述: {plugin_info['description']}")
-        if plugin_info['variables']:
-            print("变量:")
-            for var in plugin_info['variables']:
-                print(f"  - {var['name']}: {var['description']}")
-    
-    print("\n=== 当前系统状态 ===")
-    print(allocator.show_current_status())
@@ -153,6 +153,9 @@ def update_config():
             
             config_manager.set_config('pathTemplate', template)
         
+        # 配置修改默认延迟写入；首次配置后前端会立即请求重启，这里先确保写入config.yaml
+        config_manager.flush()
+        
         response_data = {
             'success': True,
             'message': '配置更新成功'
@@ -180,6 +183,9 @@ def restart_server():
         def delayed_restart():
             time.sleep(delay)
             print("\n[INFO] 重启服务器...")
+            # os._exit不会等待延迟写入配置的线程，退出前先写入尚未保存的配置
+            if config_manager:
+                config_manager.flush()
             # 使用退出码1来指示启动器需要重启
             os._exit(1)
         
@@ -1265,6 +1271,9 @@ def monitor_heartbeat():
         # 如果超过3秒没有收到心跳包，退出服务器
         if current_time - last_heartbeat > 3:
             print(f"\n[INFO] 心跳包超时，前端可能已关闭，退出服务器...")
+            # os._exit不会等待延迟写入配置的线程，退出前先写入尚未保存的配置
+            if config_manager:
+                config_manager.flush()
             os._exit(0)
 
 if __name__ == '__main__':
@@ -18,9 +18,16 @@ License: MIT
 
 import yaml
 import os
+import threading
 from typing import Dict, Any, Optional, Union, Type
 from types import NoneType
 
+# 优先使用libyaml的C实现，未编译libyaml时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper  # type: ignore[assignment]
+
 
 class Config:
     """
@@ -33,8 +40,14 @@ class Config:
         - target_folder: 目标输出目录路径
         - hash_check_enable: 文件完整性校验算法
         - pathTemplate: 路径模板字符串
+        - last_browse_dir: 最近一次浏览文件的目录
+        - copy_buffer_size / copy_parallelism: 文件复制参数，"auto"表示自动选择
     """
     
+    # 已解析配置的进程级缓存：(config.yaml的修改时间, 验证字典)
+    # 不带覆盖项创建的实例共享同一个验证字典，配置文件未变化时无需重新解析和写回
+    _shared_config: Optional[tuple] = None
+    
     class ValidatedDict(Dict[str, Any]):
         """
         类型验证字典类
@@ -45,7 +58,7 @@ class Config:
         
         特性：
         - 强制类型检查：每个配置项都有指定的数据类型
-        - 自动保存：配置更改时立即写入文件
+        - 自动保存：配置更改后短暂延迟合并写入文件，连续修改只写一次
         - 键名限制：只允许预定义的配置项
         - 完整性验证：确保所有必需配置项都存在
         """
@@ -56,10 +69,16 @@ class Config:
             "hash_check_enable": str,       # 启用的哈希算法名称
             "pathTemplate": (str, NoneType), # 路径模板字符串，允许None
             "external_plugins_dir": str, # 外部插件目录
+            "last_browse_dir": str,         # 最近一次浏览文件的目录
+            "copy_buffer_size": (str, int), # 复制分块大小（字节），"auto"表示自动选择
+            "copy_parallelism": (str, int), # 复制线程数，"auto"表示自动选择
         }
 
         # 配置文件路径，默认为当前工作目录下的config.yaml
         __config_path: str = os.path.join(os.getcwd(), 'config.yaml')
+        
+        # 修改配置后延迟写入的秒数，期间的后续修改合并为一次写入
+        write_delay: float = 0.2
 
         def __setitem__(self, key: str, value: Any) -> None:
             """
@@ -74,7 +93,7 @@ class Config:
                 TypeError: 当值类型与期望类型不匹配时抛出
                 
             Note:
-                每次成功设置后都会自动触发__write_config()保存到文件
+                设置成功后在write_delay秒后写入文件，期间的其他修改合并为一次写入
             """
             if key not in self.allowed_keys:
                 raise KeyError(f"配置键 '{key}' 不在允许的键列表中。"
@@ -92,9 +111,7 @@ class Config:
                               f"实际得到 {type(value).__name__} 类型")
             
             super().__setitem__(key, value)
-            # 输出当前配置状态用于调试
-            print(self)
-            self.__write_config()
+            self.__schedule_write()
 
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             """
@@ -112,6 +129,9 @@ class Config:
                 初始化完成后会自动调用__write_config()保存配置
             """
             super().__init__(*args, **kwargs)
+            self.__write_lock = threading.Lock()
+            self.__write_timer: Optional[threading.Timer] = None
+            self.__dirty = False
             
             # 从位置参数和关键字参数中收集所有配置项
             all_items = {}
@@ -146,22 +166,56 @@ class Config:
                 super().__setitem__(key, value)
             self.__write_config()
 
+        def __schedule_write(self) -> None:
+            """
+            标记配置已修改，并（重新）安排延迟写入
+            
+            每次调用都会取消尚未执行的写入计时器，因此连续修改只在最后一次修改后写入一次。
+            计时器线程不是守护线程，解释器正常退出前会等待尚未完成的写入；
+            通过os._exit等方式直接结束进程时不会等待，调用方需要先调用flush()。
+            """
+            with self.__write_lock:
+                self.__dirty = True
+                if self.__write_timer is not None:
+                    self.__write_timer.cancel()
+                self.__write_timer = threading.Timer(self.write_delay, self.flush)
+                self.__write_timer.start()
+
+        def flush(self) -> None:
+            """
+            立即写入尚未保存的配置修改
+            
+            没有未保存的修改时不执行任何操作。
+            """
+            with self.__write_lock:
+                if self.__write_timer is not None:
+                    self.__write_timer.cancel()
+                    self.__write_timer = None
+                if not self.__dirty:
+                    return
+                self.__dirty = False
+                self.__write_config()
+
         def __write_config(self) -> None:
             """
             将当前配置写入config.yaml文件
             
-            该方法在配置发生任何更改时自动调用，确保配置的持久化存储。
-            使用safe_dump确保输出格式的安全性和可读性。
+            该方法在初始化时和延迟写入到期时调用，确保配置的持久化存储。
+            使用SafeDumper确保输出格式的安全性和可读性。
             
             Raises:
                 IOError: 当文件写入失败时可能抛出IO相关异常
             """
             try:
                 with open(self.__config_path, 'w', encoding='utf-8') as yaml_file:
-                    yaml.safe_dump(dict(self), yaml_file, 
-                                 default_flow_style=False, 
-                                 allow_unicode=True)
-                    yaml_file.close()
+                    yaml.dump(dict(self), yaml_file, Dumper=SafeDumper,
+                              default_flow_style=False, 
+                              allow_unicode=True)
+                # 写入的是共享配置时同步更新缓存的修改时间，否则下次Config()会把自己的写入
+                # 当作外部修改，重新解析并创建另一个验证字典
+                shared = Config._shared_config
+                if shared is not None and shared[1] is self:
+                    Config._shared_config = (os.stat(self.__config_path).st_mtime_ns, self)
             except Exception as e:
                 print(f"警告: 保存配置文件失败: {e}")
 
@@ -182,26 +236,48 @@ class Config:
             - 首次运行时会创建默认配置文件
             - 配置文件损坏时会自动重置为默认值
             - 支持配置项的实时验证和类型检查
+            - 不带覆盖项且配置文件未修改时直接复用已解析的配置
         """
+        if not configs:
+            try:
+                config_mtime = os.stat('config.yaml').st_mtime_ns
+            except OSError:
+                config_mtime = None
+            shared = Config._shared_config
+            if shared is not None and config_mtime is not None and shared[0] == config_mtime:
+                self.__config__ = shared[1]
+                return
+        
         # 默认配置模板，确保系统基本可用性
         default_config: Dict[str, Any] = {
             "target_folder": '',                    # 空字符串表示需要用户配置
             "hash_check_enable": 'md5',                # 空字符串表示不启用校验
             "pathTemplate": "{filename}",            # 默认模板，仅使用文件名
             "external_plugins_dir": os.path.join(os.path.dirname(__file__), 'plugins'),          # 外部插件目录，默认为None
+            "last_browse_dir": "",                  # 空字符串表示使用用户主目录
+            "copy_buffer_size": "auto",             # 根据待复制文件自动选择
+            "copy_parallelism": "auto",             # 根据待复制文件自动选择
         }
         
         try:
             # 尝试读取现有配置文件
             with open('config.yaml', 'r', encoding='utf-8') as yaml_file:
-                yaml_data = yaml.safe_load(yaml_file) or {}
-                # 合并传入的配置项，允许运行时覆盖
-                yaml_file.close()
+                yaml_data = yaml.load(yaml_file, Loader=SafeLoader) or {}
 
+            # 合并传入的配置项，允许运行时覆盖
             yaml_data.update(configs)
+            # 旧版本的配置文件可能缺少后续新增的配置项，使用默认值补齐
+            for key, value in default_config.items():
+                yaml_data.setdefault(key, value)
             print("111",yaml_data,"111")
             # 验证并创建ValidatedDict实例
             self.__config__ = Config.ValidatedDict(yaml_data)
+            if not configs:
+                # 验证字典初始化时会写回文件，记录写回后的修改时间
+                try:
+                    Config._shared_config = (os.stat('config.yaml').st_mtime_ns, self.__config__)
+                except OSError:
+                    Config._shared_config = None
                 
 
         except FileNotFoundError:
@@ -274,10 +350,22 @@ class Config:
             - target_folder (str): 目标文件夹路径
             - hash_check_enable (str): 启用的哈希算法名称
             - pathTemplate (str|None): 路径模板字符串
+            - last_browse_dir (str): 最近一次浏览文件的目录
+            - copy_buffer_size (str|int): 复制分块大小，"auto"表示自动选择
+            - copy_parallelism (str|int): 复制线程数，"auto"表示自动选择
         """
         self.__config__[key] = value
         return True
     
+    def flush(self) -> None:
+        """
+        立即将尚未保存的配置修改写入config.yaml
+        
+        set_config的修改会在短暂延迟后自动写入，需要确保文件已是最新内容时
+        （例如其他进程即将读取配置文件）调用此方法。
+        """
+        self.__config__.flush()
+    
     # def get_plugin_config(self, plugin_name: str, default: Any = None) -> Any:
     #     """
     #     获取指定插件的配置数据
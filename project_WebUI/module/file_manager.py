@@ -9,12 +9,13 @@
 - 智能复制策略：小文件单线程，大文件多线程分块复制
 - 完整性验证：支持MD5、SHA1、SHA256、SHA512等哈希算法
 - 进度显示：集成rich库提供美观的进度条显示
-- 错误恢复：复制失败时自动清理临时文件
+- 错误恢复：复制失败时自动删除未完成的目标文件
 - 元数据保留：复制后保持原文件的时间戳等属性
 
 性能优化：
 - 自适应分块大小，根据文件大小调整策略
 - 并行读写，充分利用多核CPU和存储带宽
+- 零拷贝：支持时由内核直接在文件间复制数据（copy_file_range/sendfile）
 - 内存友好，避免大文件一次性加载到内存
 
 Author: File Classifier Project
@@ -23,6 +24,7 @@ License: MIT
 
 from typing import List, Tuple, Optional
 import os
+import errno
 import hashlib
 import rich.progress
 import importlib.util
@@ -31,6 +33,65 @@ from concurrent.futures import ThreadPoolExecutor
 from module import config  # 导入配置管理器
 
 
+def _copy_range(source_fd: int, target_fd: int, offset: int, count: int, buffer_size: int) -> None:
+    """
+    将源文件从offset开始的count字节复制到目标文件的相同位置
+    
+    依次尝试os.copy_file_range和os.sendfile，由内核直接在文件之间复制数据，
+    不经过Python内存；两者都不可用（如Windows、跨文件系统的旧内核）时，
+    回退为按buffer_size分段读写。
+    
+    Args:
+        source_fd: 源文件描述符
+        target_fd: 目标文件描述符，目标文件需已存在且可写
+        offset: 复制区间在文件中的起始位置，源和目标相同
+        count: 要复制的字节数
+        buffer_size: 回退到普通读写时每次读取的字节数
+        
+    Raises:
+        OSError: 磁盘空间不足或读写失败时抛出
+    """
+    end = offset + count
+    
+    # 每种零拷贝方式失败后从已复制到的位置继续，由下一种方式接手
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while offset < end:
+                copied = os.copy_file_range(source_fd, target_fd, end - offset, offset, offset)
+                if copied == 0:
+                    return  # 源文件已到末尾
+                offset += copied
+            return
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    
+    if hasattr(os, 'sendfile'):
+        try:
+            os.lseek(target_fd, offset, os.SEEK_SET)
+            while offset < end:
+                sent = os.sendfile(target_fd, source_fd, offset, end - offset)
+                if sent == 0:
+                    return
+                offset += sent
+            return
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    
+    os.lseek(source_fd, offset, os.SEEK_SET)
+    os.lseek(target_fd, offset, os.SEEK_SET)
+    while offset < end:
+        data = os.read(source_fd, min(buffer_size, end - offset))
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            written = os.write(target_fd, view)
+            view = view[written:]
+        offset += len(data)
+
+
 class current_copying_instance:
     """
     文件复制实例管理类
@@ -45,34 +106,37 @@ class current_copying_instance:
     3. 根据文件大小选择复制策略（单线程/多线程）
     4. 执行文件复制操作
     5. 验证目标文件完整性（如果启用校验）
-    6. 清理临时文件（如果复制失败）
+    6. 删除未完成的目标文件（如果复制失败）
     
     Attributes:
-        __config: 配置管理器实例
         __file_path__: 源文件的绝对路径
         __hash_func__: 使用的哈希算法名称，空字符串表示不校验
+        __source_hash: 源文件哈希值，在单线程复制时顺带计算
     """
     
-    def __init__(self, source_file_path: str) -> None:
+    def __init__(self, source_file_path: str, hash_func: Optional[str] = None) -> None:
         """
         初始化文件复制实例
         
         Args:
             source_file_path: 源文件路径，支持相对路径和绝对路径
+            hash_func: 哈希算法名称，为None时从配置文件读取，
+                       空字符串表示不启用校验
             
         Note:
-            - 会自动从配置文件读取哈希校验设置
+            - 未指定hash_func时会自动从配置文件读取哈希校验设置
             - 只有在hashlib支持且配置启用时才会进行哈希校验
             - 配置中的hash_check_enable为空字符串时表示不启用校验
         """
-        self.__config = config.Config()  # 获取配置实例
         self.__file_path__: str = source_file_path
+        self.__source_hash: str = ""
         
-        # 根据配置决定哈希校验算法
-        hash_config = self.__config.get_config("hash_check_enable")
-        if (hash_config and 
-            hash_config in hashlib.algorithms_available):
-            self.__hash_func__: str = hash_config
+        # 根据参数或配置决定哈希校验算法
+        if hash_func is None:
+            hash_func = config.Config().get_config("hash_check_enable")
+        if (hash_func and 
+            hash_func in hashlib.algorithms_available):
+            self.__hash_func__: str = hash_func
         else:
             self.__hash_func__ = ""
 
@@ -112,21 +176,48 @@ class current_copying_instance:
             print(f"计算哈希值时出错: {e}")
             return ""
     
-    def __fastcopy(self, target_path: str, max_workers: int = 4, chunk_size: int = 1024 * 1024) -> bool:
+    def __copy_with_hash(self, target_path: str, buffer_size: int = 1024 * 1024) -> str:
+        """
+        单次读取源文件，同时写入目标文件并计算源文件哈希值
+        
+        将"计算源文件哈希"和"复制文件"两次完整读取合并为一次读取，
+        复制完成后同样保留文件元数据。
+        
+        Args:
+            target_path: 目标文件路径
+            buffer_size: 每次读取的字节数，默认1MB
+            
+        Returns:
+            str: 源文件的十六进制哈希字符串
+        """
+        hash_obj = hashlib.new(self.__hash_func__)
+        with open(self.__file_path__, 'rb') as source_file, open(target_path, 'wb') as target_file:
+            for chunk in iter(lambda: source_file.read(buffer_size), b''):
+                hash_obj.update(chunk)
+                target_file.write(chunk)
+        
+        shutil.copystat(self.__file_path__, target_path)
+        return hash_obj.hexdigest()
+    
+    def __fastcopy(self, target_path: str, max_workers: int = 4, chunk_size: int = 1024 * 1024,
+                   chunked: bool = True) -> bool:
         """
         多线程快速文件复制实现
         
         根据文件大小智能选择复制策略：小文件使用单线程直接复制，
-        大文件使用多线程分块并行复制。支持自动错误恢复和临时文件清理。
+        大文件使用多线程分块并行复制。复制失败时自动删除未完成的目标文件。
         
         复制策略：
-        - 文件 < 2MB: 单线程复制，使用shutil.copy2保留元数据
-        - 文件 ≥ 2MB: 多线程分块复制，提高大文件传输效率
+        - 文件 < 2MB: 单线程复制，使用shutil.copy2保留元数据；
+          启用校验且尚未得到源文件哈希时，复制的同时计算源文件哈希
+        - 文件 ≥ 2MB: 多线程分块复制，各线程将自己的区间直接写入目标文件的对应位置，
+          支持时由内核完成零拷贝复制，提高大文件传输效率
         
         Args:
             target_path: 目标文件路径
             max_workers: 最大线程数，默认4个线程
-            chunk_size: 每个分块的大小（字节），默认1MB
+            chunk_size: 每个分块的大小（字节），默认1MB；单线程复制并计算哈希时作为读取缓冲区大小
+            chunked: 是否允许分块复制，为False时始终使用单线程复制
             
         Returns:
             bool: 复制成功返回True，失败返回False
@@ -134,7 +225,7 @@ class current_copying_instance:
         Note:
             - 自动创建目标目录
             - 保留文件元数据（时间戳、权限等）
-            - 复制失败时自动清理临时文件
+            - 复制失败时自动删除未完成的目标文件
             - 支持大文件的内存友好处理
             
         Raises:
@@ -150,10 +241,14 @@ class current_copying_instance:
             file_size = os.path.getsize(self.__file_path__)
             print(f"文件大小: {file_size} 字节 ({file_size / (1024*1024):.2f} MB)")
             
-            # 小文件使用单线程复制，避免多线程开销
-            if file_size < chunk_size * 2:
-                print("文件较小，使用单线程复制")
-                shutil.copy2(self.__file_path__, target_path)
+            # 小文件或禁用分块时使用单线程复制，避免多线程开销
+            if not chunked or file_size < chunk_size * 2:
+                if self.__hash_func__ and not self.__source_hash:
+                    print("文件较小或未启用分块，使用单线程复制并同时计算源文件哈希值")
+                    self.__source_hash = self.__copy_with_hash(target_path, chunk_size)
+                else:
+                    print("文件较小或未启用分块，使用单线程复制")
+                    shutil.copy2(self.__file_path__, target_path)
                 return True
             
             # 大文件使用多线程分块复制
@@ -165,31 +260,30 @@ class current_copying_instance:
             
             print(f"分块策略: {num_chunks}个分块，每块约{base_chunk_size / (1024*1024):.2f}MB")
             
+            # 预先创建目标文件并设定最终大小，各分块直接写入各自的位置，无需临时分块文件和合并
+            with open(target_path, 'wb') as target_file:
+                target_file.truncate(file_size)
+            
             # 线程执行结果跟踪
             results = [False] * num_chunks
             
             def copy_chunk(start_pos: int, end_pos: int, chunk_id: int) -> bool:
                 """
-                复制文件的指定分块
+                复制文件的指定分块到目标文件的相同位置
                 
                 Args:
                     start_pos: 分块在文件中的起始位置
                     end_pos: 分块在文件中的结束位置
-                    chunk_id: 分块编号，用于临时文件命名
+                    chunk_id: 分块编号
                     
                 Returns:
                     bool: 分块复制成功返回True
                 """
                 try:
-                    # 读取指定范围的文件数据
-                    with open(self.__file_path__, 'rb') as source_file:
-                        source_file.seek(start_pos)
-                        data = source_file.read(end_pos - start_pos)
-                        
-                        # 写入临时分块文件
-                        temp_chunk_path = f"{target_path}.part{chunk_id}"
-                        with open(temp_chunk_path, 'wb') as chunk_file:
-                            chunk_file.write(data)
+                    # 每个线程使用独立的文件描述符，互不影响读写位置
+                    with open(self.__file_path__, 'rb') as source_file, open(target_path, 'r+b') as target_file:
+                        _copy_range(source_file.fileno(), target_file.fileno(),
+                                    start_pos, end_pos - start_pos, chunk_size)
                     
                     # 更新结果状态
                     results[chunk_id] = True
@@ -223,27 +317,11 @@ class current_copying_instance:
             # 检查所有分块是否都复制成功
             if not all(results):
                 print(f"部分分块复制失败。结果状态: {results}")
-                # 清理失败的分块文件
-                self._cleanup_temp_files(target_path, num_chunks)
+                # 删除未完成的目标文件
+                os.remove(target_path)
                 return False
             
-            print(f"所有 {num_chunks} 个分块复制成功，正在合并...")
-            
-            # 将所有分块合并到最终文件
-            with open(target_path, 'wb') as target_file:
-                for i in range(num_chunks):
-                    part_file = f"{target_path}.part{i}"
-                    if not os.path.exists(part_file):
-                        print(f"分块文件 {part_file} 丢失！")
-                        return False
-                        
-                    with open(part_file, 'rb') as chunk_file:
-                        target_file.write(chunk_file.read())
-                    
-                    # 删除临时分块文件
-                    os.remove(part_file)
-            
-            print("文件合并完成")
+            print(f"所有 {num_chunks} 个分块复制成功")
             
             # 复制文件元数据（时间戳、权限等）
             shutil.copystat(self.__file_path__, target_path)
@@ -260,8 +338,6 @@ class current_copying_instance:
             
         except Exception as e:
             print(f"文件复制过程中出现异常: {e}")
-            # 清理可能产生的临时文件
-            self._cleanup_temp_files(target_path, 10)  # 清理最多10个可能的分块
             # 清理目标文件
             if os.path.exists(target_path):
                 try:
@@ -270,24 +346,8 @@ class current_copying_instance:
                     pass
             return False
     
-    def _cleanup_temp_files(self, target_path: str, max_chunks: int) -> None:
-        """
-        清理临时分块文件
-        
-        Args:
-            target_path: 目标文件路径
-            max_chunks: 最大分块数量
-        """
-        for i in range(max_chunks):
-            part_file = f"{target_path}.part{i}"
-            if os.path.exists(part_file):
-                try:
-                    os.remove(part_file)
-                    print(f"已清理临时文件: {part_file}")
-                except Exception as e:
-                    print(f"清理临时文件 {part_file} 失败: {e}")
-
-    def copy_initiator(self, destinations: Tuple[str, ...]) -> bool:
+    def copy_initiator(self, destinations: Tuple[str, ...], max_workers: int = 4,
+                       chunk_size: int = 1024 * 1024, chunked: bool = True) -> bool:
         """
         启动文件复制流程到多个目标位置
         
@@ -296,13 +356,17 @@ class current_copying_instance:
         
         工作流程：
         1. 验证输入参数的有效性
-        2. 计算源文件哈希值（如果启用校验）
-        3. 对每个目标位置执行复制操作
+        2. 对每个目标位置执行复制操作，单线程复制时同时计算源文件哈希值
+        3. 分块复制时单独计算源文件哈希值（如果启用校验）
         4. 验证每个目标文件的完整性
         5. 清理复制失败的文件
         
         Args:
             destinations: 目标路径元组，文件将被复制到这些位置
+            max_workers: 分块复制时的最大线程数
+            chunk_size: 分块大小（字节），同时决定启用分块复制的文件大小阈值，
+                        单线程复制并计算哈希时作为读取缓冲区大小
+            chunked: 是否允许对大文件进行分块复制
             
         Returns:
             bool: 所有目标都复制成功返回True，否则返回False
@@ -328,15 +392,8 @@ class current_copying_instance:
         print(f"开始复制文件: {self.__file_path__}")
         print(f"目标数量: {len(destinations)}")
         
-        # 计算源文件哈希值（如果启用校验）
-        source_hash = ""
-        if self.__hash_func__:
-            print("正在计算源文件哈希值...")
-            source_hash = self.get_hash(self.__file_path__)
-            if not source_hash:
-                print("警告: 无法计算源文件哈希值，跳过完整性校验")
-            else:
-                print(f"源文件哈希值: {source_hash}")
+        # 源文件哈希值优先在单线程复制时顺带计算，分块复制时再单独计算
+        self.__source_hash = ""
         
         overall_success = True
         successful_copies = 0
@@ -354,12 +411,23 @@ class current_copying_instance:
                 
                 # 执行文件复制
                 print("开始复制文件...")
-                if not self.__fastcopy(destination):
+                if not self.__fastcopy(destination, max_workers, chunk_size, chunked):
                     print(f"❌ 复制到 {destination} 失败")
                     overall_success = False
                     continue
                 
                 # 完整性校验（如果启用）
+                source_hash = ""
+                if self.__hash_func__:
+                    if not self.__source_hash:
+                        print("正在计算源文件哈希值...")
+                        self.__source_hash = self.get_hash(self.__file_path__)
+                    source_hash = self.__source_hash
+                    if not source_hash:
+                        print("警告: 无法计算源文件哈希值，跳过完整性校验")
+                    else:
+                        print(f"源文件哈希值: {source_hash}")
+                
                 if source_hash:
                     print("正在验证文件完整性...")
                     target_hash = self.get_hash(destination)
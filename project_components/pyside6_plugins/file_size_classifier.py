@@ -41,8 +41,13 @@ Version: 1.0.0
 """
 
 import os
+from bisect import bisect_right
 from typing import Literal
 
+# 各分类的上界（字节，不含），与_SIZE_CATEGORIES一一对应，最后一类没有上界
+_SIZE_THRESHOLDS = (1024, 1024 * 1024, 10 * 1024 * 1024, 100 * 1024 * 1024)
+_SIZE_CATEGORIES = ("tiny", "small", "medium", "large", "huge")
+
 
 def file_size_classifier(filepath: str) -> Literal["tiny", "small", "medium", "large", "huge", "unknown"]:
     """
@@ -71,7 +76,7 @@ def file_size_classifier(filepath: str) -> Literal["tiny", "small", "medium", "l
     5. huge (≥ 100MB): 长视频、数据库、虚拟机镜像
     
     性能特点：
-    - 高效：直接使用os.path.getsize()系统调用
+    - 高效：只调用一次os.stat()，按阈值表二分查找分类
     - 安全：处理文件不存在或权限不足的情况
     - 准确：使用精确的字节计算，不是近似值
     
@@ -97,26 +102,16 @@ def file_size_classifier(filepath: str) -> Literal["tiny", "small", "medium", "l
         - 分类结果可直接用于路径模板和文件组织
     """
     try:
-        if not os.path.exists(filepath):
-            return "unknown"
-        
-        file_size = os.path.getsize(filepath)
-        
-        # 定义大小分类（字节）
-        if file_size < 1024:  # < 1KB
-            return "tiny"
-        elif file_size < 1024 * 1024:  # < 1MB
-            return "small"
-        elif file_size < 10 * 1024 * 1024:  # < 10MB
-            return "medium"
-        elif file_size < 100 * 1024 * 1024:  # < 100MB
-            return "large"
-        else:  # >= 100MB
-            return "huge"
-    
+        # 一次stat同时完成存在性检查和大小获取
+        file_size = os.stat(filepath).st_size
+    except (OSError, ValueError):
+        return "unknown"
     except Exception as e:
         print(f"计算文件大小分类时出错: {e}")
         return "unknown"
+    
+    # 严格小于上界：bisect_right使恰好等于阈值的大小归入下一类
+    return _SIZE_CATEGORIES[bisect_right(_SIZE_THRESHOLDS, file_size)]
 
 def init() -> None:
     """
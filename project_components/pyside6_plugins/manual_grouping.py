@@ -96,9 +96,14 @@ class Strategy:
     pattern: str
     range_filter: str = ""  # 新增：范围过滤器（用于通配符）
     compiled_regex: Optional[re.Pattern] = None  # 预编译的正则表达式
+    constraints: Optional[List[Optional[Dict]]] = None  # 预解析的约束参数（带约束的通配符）
+    capture_regex: Optional[re.Pattern] = None  # 预编译的带捕获组正则（带约束的通配符）
     
     def __post_init__(self):
         """后初始化，预编译正则表达式以提高性能"""
+        # 策略类型或参数变更后会重新调用，先清除上次的预处理结果
+        self.constraints = None
+        self.capture_regex = None
         if self.strategy_type == StrategyType.REGEX:
             try:
                 self.compiled_regex = re.compile(self.pattern)
@@ -115,11 +120,17 @@ class Strategy:
                         f"通配符数量({wildcard_count})与参数数量({len(constraints)})不匹配。"
                         f"模式: '{self.pattern}', 参数: '{self.range_filter}'"
                     )
+                self.constraints = constraints
             
             # 将通配符转换为正则表达式并预编译
             try:
                 regex_pattern = fnmatch.translate(self.pattern)
                 self.compiled_regex = re.compile(regex_pattern)
+                # 带约束的普通通配符在匹配时需要捕获组，同样只编译一次（连续通配符走动态规划）
+                if self.constraints is not None and '**' not in self.pattern:
+                    capture_pattern = self._build_capture_pattern(self.pattern)
+                    if capture_pattern:
+                        self.capture_regex = re.compile(capture_pattern)
             except re.error as e:
                 raise ValueError(f"无效的通配符模式 '{self.pattern}': {e}")
     
@@ -135,8 +146,10 @@ class Strategy:
         if not self.range_filter.strip():
             return True  # 无约束，直接通过
             
-        # 1. 解析约束参数
-        constraints = self._parse_constraints(self.range_filter)
+        # 1. 解析约束参数（创建策略时已预解析）
+        constraints = self.constraints
+        if constraints is None:
+            constraints = self._parse_constraints(self.range_filter)
         
         # 2. 计算通配符数量
         wildcard_count = self.pattern.count('*')
@@ -152,14 +165,12 @@ class Strategy:
         if '**' in self.pattern:
             return self._validate_consecutive_wildcards(filename, self.pattern, constraints)
         
-        # 5. 普通通配符处理：构建捕获正则表达式
-        capture_pattern = self._build_capture_pattern(self.pattern)
-        if not capture_pattern:
+        # 5. 普通通配符处理：使用预编译的捕获正则表达式
+        if self.capture_regex is None:
             return True  # 无法构建捕获模式，回退到基本匹配
             
         # 6. 执行匹配并验证约束
-        import re as regex_module
-        match = regex_module.match(capture_pattern, filename)
+        match = self.capture_regex.match(filename)
         if not match:
             return False  # 基本模式不匹配
             
@@ -888,6 +899,7 @@ def manual_grouping(filepath: str) -> List[str]:
     性能优化：
     - 预编译正则表达式，避免重复编译开销
     - 使用set自动去重，提高大批量文件处理效率
+    - 分组名已匹配后跳过其余同名策略组
     - 仅对文件名进行匹配，忽略路径信息
     
     Args:
@@ -921,6 +933,9 @@ def manual_grouping(filepath: str) -> List[str]:
     matched_groups = set()  # 使用set自动去重
     
     for strategy_group in GLOBAL_STRATEGY_GROUPS:
+        # 同名策略组之间是OR逻辑，分组名已匹配时无需再评估其余同名策略组
+        if strategy_group.group_name in matched_groups:
+            continue
         if strategy_group.matches(filename):
             matched_groups.add(strategy_group.group_name)
     
@@ -100,10 +100,11 @@ class FileSizeClassifierPlugin:
             return "unknown"
         
         try:
-            if not os.path.exists(filepath):
+            # 一次stat同时完成存在性检查和大小获取
+            try:
+                file_size = os.stat(filepath).st_size
+            except (OSError, ValueError):
                 return "unknown"
-            
-            file_size = os.path.getsize(filepath)
             thresholds = self.config.get("thresholds", self.get_default_config()["thresholds"])
             
             # 根据阈值分类